@@ -5,9 +5,11 @@ import plotly.graph_objects as go
 import folium
 from streamlit_folium import st_folium
 from data.regions_data import get_indian_states_data, get_district_coordinates
-from data.weather_data import get_weather_data_for_region
-from data.crop_database import get_crop_database
-from utils.recommendation_engine import CropRecommendationEngine
+from data.weather_data import get_weather_data_for_region, get_weather_store
+from data.spatial_index import resolve_location
+from data.weather_interpolation import get_weather_data_for_location
+from data.crop_database import get_crop_database, get_crop_catalog
+from utils.recommendation_engine import get_recommendation_engine
 from pages.soil_analysis import show_soil_analysis_page
 from pages.seasonal_planning import show_seasonal_planning_page
 import numpy as np
@@ -27,6 +29,8 @@ if 'weather_data' not in st.session_state:
     st.session_state.weather_data = None
 if 'recommendations' not in st.session_state:
     st.session_state.recommendations = None
+if 'selected_location' not in st.session_state:
+    st.session_state.selected_location = None
 
 def main():
     st.title("🌾 AgriWeather Crop Advisor")
@@ -81,12 +85,26 @@ def show_home_page():
         # Display map
         map_data = st_folium(m, width=700, height=500)
         
-        # Handle map clicks
-        if map_data['last_object_clicked_popup']:
-            clicked_region = map_data['last_object_clicked_popup'].split('<br>')[0]
-            st.session_state.selected_region = clicked_region
-            st.success(f"Selected region: {clicked_region}")
-            st.rerun()
+        # Handle map clicks: markers and bare map points resolve to the nearest known location.
+        # st_folium keeps both the last marker and the last map click, so act on whichever changed
+        map_click = map_data.get('last_clicked')
+        object_click = map_data.get('last_object_clicked')
+        previous_map_click, previous_object_click = st.session_state.get('map_clicks', (None, None))
+        st.session_state.map_clicks = (map_click, object_click)
+        if map_click and map_click != previous_map_click:
+            clicked = map_click
+        elif object_click and object_click != previous_object_click:
+            clicked = object_click
+        else:
+            clicked = None
+        if clicked:
+            st.session_state.last_click = clicked
+            location = resolve_location(clicked['lat'], clicked['lng'])
+            if location != st.session_state.selected_location:
+                st.session_state.selected_location = location
+                st.session_state.selected_region = location['state']
+                st.success(f"Selected region: {location['state']}")
+                st.rerun()
     
     with col2:
         st.subheader("Region Details")
@@ -100,14 +118,26 @@ def show_home_page():
                 st.write(f"**Annual Rainfall:** {region_info['annual_rainfall']} mm")
                 st.write(f"**Temperature Range:** {region_info['temp_range']}°C")
                 
-                # Load weather data for selected region
+                location = st.session_state.selected_location
+                if location and location['kind'] != 'state':
+                    st.write(f"**Nearest {location['kind'].title()}:** {location['name']} ({location['distance_km']:.0f} km)")
+                
+                # Load weather data for selected region; clicked districts and blocks use
+                # their observations when stored, else weather interpolated at the clicked point
                 if st.button("Load Weather Data & Analyze"):
                     with st.spinner("Loading weather data..."):
-                        weather_data = get_weather_data_for_region(st.session_state.selected_region)
+                        store = get_weather_store()
+                        if location and store is not None and location['name'] in store.block_index:
+                            weather_data = get_weather_data_for_region(location['name'])
+                        elif location and location['kind'] != 'state':
+                            point = st.session_state.last_click
+                            weather_data = get_weather_data_for_location(point['lat'], point['lng'], location['name'])
+                        else:
+                            weather_data = get_weather_data_for_region(st.session_state.selected_region)
                         st.session_state.weather_data = weather_data
                         
                         # Generate recommendations
-                        engine = CropRecommendationEngine()
+                        engine = get_recommendation_engine()
                         recommendations = engine.get_recommendations(
                             region_info, weather_data
                         )
@@ -126,6 +156,7 @@ def show_home_page():
         
         if manual_region and manual_region != st.session_state.selected_region:
             st.session_state.selected_region = manual_region
+            st.session_state.selected_location = None
             st.rerun()
 
 def show_weather_analysis():
@@ -333,7 +364,7 @@ def show_profit_dashboard():
     selected_crop = st.selectbox("Select a crop for detailed analysis:", 
                                 [crop['name'] for crop in recommendations[:5]])
     
-    crop_details = next(crop for crop in recommendations if crop['name'] == selected_crop)
+    crop_details = get_crop_catalog().get(selected_crop)
     
     col1, col2 = st.columns(2)
     
@@ -0,0 +1,89 @@
+"""
+Memory of region, soil profile and location records against plain dicts,
+at district/block scale (about 700 districts and 7,000 blocks).
+
+    python benchmarks/record_memory.py [--districts 700] [--blocks 7000]
+    python -m benchmarks.record_memory [--districts 700] [--blocks 7000]
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+import numpy as np
+
+# Run as a script from anywhere: the data package lives in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data.regions_data import _base_states_data
+from data.soil_analysis import _base_soil_data
+from data.records import RegionRecord, LocationRecord, SoilProfile
+
+def synthetic_rows(districts, blocks, seed=0):
+    """
+    Region, soil and location dicts as the loaders produce them: every row
+    is a fresh dict with its own copies of the repeated strings and lists
+    """
+    rng = np.random.default_rng(seed)
+    states = _base_states_data()
+    soils = list(_base_soil_data().values())
+
+    def fresh(value):
+        # Parsed files give every row its own string and list objects
+        if isinstance(value, str):
+            return ''.join(list(value))
+        if isinstance(value, list):
+            return [fresh(item) for item in value]
+        return value
+
+    regions, profiles, locations = [], [], []
+    for d in range(districts):
+        state = states[d % len(states)]
+        regions.append({key: fresh(value) for key, value in state.items()} | {
+            'name': f'District {d}',
+            'lat': state['lat'] + rng.normal(0, 1), 'lon': state['lon'] + rng.normal(0, 1)
+        })
+        soil = soils[d % len(soils)]
+        profiles.append({key: fresh(value) for key, value in soil.items()} | {
+            'ph_range': [round(rng.uniform(5.5, 7), 1), round(rng.uniform(7, 8.5), 1)],
+            'organic_matter': round(rng.uniform(0.2, 1.2), 2)
+        })
+    for b in range(blocks):
+        district = regions[b % districts]
+        locations.append({
+            'name': f'Block {b}', 'kind': fresh('block'), 'state': fresh(states[b % districts % len(states)]['name']),
+            'district': fresh(district['name']),
+            'lat': district['lat'] + rng.normal(0, 0.2), 'lon': district['lon'] + rng.normal(0, 0.2)
+        })
+    return regions, profiles, locations
+
+def measure(build):
+    """Bytes still allocated by what build() returns"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--districts', type=int, default=700)
+    parser.add_argument('--blocks', type=int, default=7000)
+    args = parser.parse_args()
+
+    kinds = (('regions', RegionRecord), ('soil profiles', SoilProfile), ('locations', LocationRecord))
+    print(f"{'records':<16}{'count':>8}{'dicts (KiB)':>14}{'records (KiB)':>16}{'saved':>8}")
+    total_dicts = total_records = 0
+    for k, (label, record) in enumerate(kinds):
+        count = len(synthetic_rows(args.districts, args.blocks)[k])
+        dicts = measure(lambda: synthetic_rows(args.districts, args.blocks)[k])
+        records = measure(lambda: [record(row) for row in synthetic_rows(args.districts, args.blocks)[k]])
+        total_dicts += dicts
+        total_records += records
+        print(f"{label:<16}{count:>8}{dicts / 1024:>14.0f}{records / 1024:>16.0f}{1 - records / dicts:>8.0%}")
+    print(f"{'total':<16}{'':>8}{total_dicts / 1024:>14.0f}{total_records / 1024:>16.0f}{1 - total_records / total_dicts:>8.0%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+import numpy as np
+from scipy import stats
+from data.weather_data import WEATHER_VARIABLES
+from data.climate_normals import get_climate_normals
+
+# Daily maximum temperature of a heat day (IMD heatwave threshold for the plains)
+HEAT_DAY_TEMP = 40.0
+# Spread of daily maxima around the monthly mean, for monthly-only history
+DAILY_MAX_TEMP_STD = 3.0
+# A heatwave year has more heat days than this share of all region-years
+HEATWAVE_QUANTILE = 0.75
+
+# Standardized precipitation index bounds of drought and flood years, with
+# SPI measured against the rainfall of all regions together
+DROUGHT_SPI = -1.0
+FLOOD_SPI = 1.5
+
+# Probability (%) at or above which a risk is rated High or Medium
+RISK_LEVELS = (('High', 25), ('Medium', 10))
+
+DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+class ClimateExtremes:
+    """
+    Extreme-event statistics of many regions from their yearly history:
+    SPI-style drought index, heat-day counts, empirical exceedance
+    probabilities and return periods, all computed as (regions, years) arrays.
+    Drought, flood and heatwave years are judged against references shared
+    by all regions, so their probabilities differ between dry and wet or
+    hot and mild regions.
+    """
+
+    def __init__(self, regions, years, rainfall, temperature, heat_days):
+        self.regions = list(regions)
+        self.region_index = {name: i for i, name in enumerate(self.regions)}
+        self.years = list(years)
+        self.series = {
+            'rainfall': np.asarray(rainfall, dtype=float),
+            'temperature': np.asarray(temperature, dtype=float),
+            'heat_days': np.asarray(heat_days, dtype=float)
+        }
+        self.spi = standardized_precipitation_index(self.series['rainfall'], pooled=True)
+
+        observed = np.isfinite(self.spi)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.drought_probability = (self.spi <= DROUGHT_SPI).sum(axis=1) / observed.sum(axis=1)
+            self.flood_probability = (self.spi >= FLOOD_SPI).sum(axis=1) / observed.sum(axis=1)
+        self.heatwave_days = float(np.nanquantile(self.series['heat_days'], HEATWAVE_QUANTILE))
+        self.heatwave_probability = self.exceedance_probability('heat_days', self.heatwave_days)
+        self.mean_heat_days = np.nanmean(self.series['heat_days'], axis=1)
+
+    def exceedance_probability(self, variable, threshold):
+        """Empirical probability per region that a year's value exceeds threshold"""
+        values = self.series[variable]
+        threshold = np.asarray(threshold, dtype=float)
+        if threshold.ndim == 1:
+            threshold = threshold[:, None]
+        with np.errstate(invalid='ignore'):
+            return (values > threshold).sum(axis=1) / np.isfinite(values).sum(axis=1)
+
+    def return_period(self, variable, value):
+        """
+        Years between exceedances of value per region, from Weibull plotting
+        positions (n + 1) / rank; inf when value was never reached
+        """
+        values = self.series[variable]
+        value = np.asarray(value, dtype=float)
+        if value.ndim == 1:
+            value = value[:, None]
+        rank = (values >= value).sum(axis=1)
+        n = np.isfinite(values).sum(axis=1)
+        with np.errstate(divide='ignore'):
+            return np.where(rank > 0, (n + 1) / rank, np.inf)
+
+    def return_level(self, variable, period):
+        """Value per region exceeded on average once every `period` years"""
+        return np.nanquantile(self.series[variable], 1 - 1 / period, axis=1)
+
+    def region_risks(self, region_name):
+        """Drought, heatwave and flood risk of one region in percent, rated High/Medium/Low"""
+        row = self.region_index[region_name]
+        return {
+            'drought': _risk_entry(self.drought_probability[row]),
+            'heatwave': {**_risk_entry(self.heatwave_probability[row]),
+                         'mean_heat_days': round(float(self.mean_heat_days[row]), 1)},
+            'flood': _risk_entry(self.flood_probability[row])
+        }
+
+def _risk_entry(probability):
+    percent = round(float(probability) * 100, 1)
+    risk = next((level for level, bound in RISK_LEVELS if percent >= bound), 'Low')
+    return {
+        'risk': risk,
+        'probability': percent,
+        'return_period': round(1 / float(probability), 1) if probability > 0 else None
+    }
+
+def standardized_precipitation_index(rainfall, pooled=False):
+    """
+    SPI of each year's rainfall: a gamma distribution (Thom's estimator,
+    with the share of dry years kept apart) is fitted to each region's own
+    record, or with pooled=True to all regions' records together, and
+    mapped onto the standard normal
+    """
+    rainfall = np.asarray(rainfall, dtype=float)
+    observed = np.isfinite(rainfall)
+    wet = observed & (rainfall > 0)
+    axis = None if pooled else 1
+    n = observed.sum(axis=axis, keepdims=True)
+    n_wet = wet.sum(axis=axis, keepdims=True)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(wet, rainfall, 0).sum(axis=axis, keepdims=True) / n_wet
+        log_mean = np.where(wet, np.log(np.where(wet, rainfall, 1)), 0).sum(axis=axis, keepdims=True) / n_wet
+        a = np.log(mean) - log_mean
+        shape = (1 + np.sqrt(1 + 4 * a / 3)) / (4 * a)
+        scale = mean / shape
+        dry_share = (n - n_wet) / n
+
+        cdf = stats.gamma.cdf(rainfall, shape, scale=scale)
+        probability = dry_share + (1 - dry_share) * cdf
+        spi = stats.norm.ppf(np.clip(probability, 1e-6, 1 - 1e-6))
+
+    return np.where(observed, spi, np.nan)
+
+def expected_heat_days(monthly_max_temp):
+    """
+    Expected heat days per year from (..., months) mean daily maxima, taking
+    daily maxima as normally spread around the monthly mean
+    """
+    exceed = stats.norm.sf((HEAT_DAY_TEMP - monthly_max_temp) / DAILY_MAX_TEMP_STD)
+    return (exceed * DAYS_IN_MONTH).sum(axis=-1)
+
+def build_climate_extremes(normals):
+    """Extremes of every region in a climate normals window"""
+    years, history = normals.history_cube()
+    monthly = {variable: history[..., k] for k, variable in enumerate(WEATHER_VARIABLES)}
+    return ClimateExtremes(
+        normals.regions, years,
+        rainfall=monthly['rainfall'].sum(axis=-1),
+        temperature=monthly['avg_temp'].mean(axis=-1),
+        heat_days=expected_heat_days(monthly['max_temp'])
+    )
+
+def build_climate_extremes_from_store(store, years):
+    """Extremes of every block of a weather store, counting heat days from daily maxima"""
+    rainfall, temperature, heat_days = [], [], []
+    for year in years:
+        monthly = store.monthly_cube(year)
+        rainfall.append(monthly[..., WEATHER_VARIABLES.index('rainfall')].sum(axis=-1))
+        temperature.append(np.nanmean(monthly[..., WEATHER_VARIABLES.index('avg_temp')], axis=-1))
+        heat_days.append((store.columns['max_temp'][:, store.year_slice(year)] >= HEAT_DAY_TEMP).sum(axis=1))
+    return ClimateExtremes(
+        store.blocks, years,
+        rainfall=np.stack(rainfall, axis=1),
+        temperature=np.stack(temperature, axis=1),
+        heat_days=np.stack(heat_days, axis=1)
+    )
+
+_climate_extremes = None
+
+def get_climate_extremes(region_names=()):
+    """Extremes of the shared climate normals, recomputed only when the normals change"""
+    global _climate_extremes
+    normals = get_climate_normals(region_names)
+    version = normals.version
+    if _climate_extremes is None or _climate_extremes[0] != version:
+        _climate_extremes = (version, build_climate_extremes(normals))
+    return _climate_extremes[1]
@@ -0,0 +1,259 @@
+import itertools
+import numpy as np
+from datetime import datetime
+from data.regions_data import get_indian_states_data
+from data.weather_data import WEATHER_VARIABLES, REGIONAL_PATTERNS, generate_weather_cube, _weather_dict
+
+# Length of the rolling climatological window in years
+NORMALS_WINDOW = 30
+NORMAL_PERCENTILES = (10, 50, 90)
+
+# Variables accumulated over the year rather than averaged
+ANNUAL_TOTALS = ('rainfall', 'rainy_days')
+
+# Process-wide version numbers, so no two states of any normals share one
+_versions = itertools.count(1)
+
+class ClimateNormals:
+    """
+    Rolling (regions x months x variables) climate normals over the last
+    `window` appended years. Means and standard deviations come from running
+    sums; percentiles from a sorted window per cell that is updated by one
+    deletion and one insertion per appended year, so history is never rescanned.
+    """
+
+    def __init__(self, regions, window=NORMALS_WINDOW, percentiles=NORMAL_PERCENTILES, states=None):
+        self.regions = list(regions)
+        self.region_index = {name: i for i, name in enumerate(self.regions)}
+        self.states = list(states) if states is not None else [None] * len(self.regions)
+        self.window = window
+        self.percentile_levels = tuple(percentiles)
+        cells = (len(self.regions), 12, len(WEATHER_VARIABLES))
+
+        # Year ring buffer, needed to retire the oldest year from the sums
+        self.history = np.full((len(self.regions), window) + cells[1:], np.nan)
+        self.slot_years = np.full(window, -1)
+        self.appended = 0
+        # Changes whenever the data does; caches key on it instead of on the object
+        self.version = next(_versions)
+
+        self.count = np.zeros(cells, dtype=int)
+        self.shift = None  # Sums are kept relative to the first year to limit cancellation
+        self.total = np.zeros(cells)
+        self.total_sq = np.zeros(cells)
+        self.sorted_window = np.full(cells + (window,), np.inf)  # Missing values sort last as inf
+        self.percentiles = np.full(cells + (len(self.percentile_levels),), np.nan)
+
+    @property
+    def years(self):
+        """Years currently in the window, oldest first"""
+        return sorted(int(year) for year in self.slot_years if year >= 0)
+
+    def append_year(self, year, monthly):
+        """Add one year of (regions, months, variables) observations, retiring the oldest year once full"""
+        monthly = np.asarray(monthly, dtype=float)
+        slot = self.appended % self.window
+        old = self.history[:, slot]
+
+        if self.shift is None:
+            self.shift = np.nan_to_num(monthly)
+        old_values = np.where(np.isnan(old), 0, old - self.shift)
+        new_values = np.where(np.isnan(monthly), 0, monthly - self.shift)
+        self.total += new_values - old_values
+        self.total_sq += new_values ** 2 - old_values ** 2
+        self.count += np.isfinite(monthly).astype(int) - np.isfinite(old).astype(int)
+
+        self.sorted_window = _replace_sorted(self.sorted_window, old, monthly)
+        self.percentiles = self._window_percentiles()
+
+        self.history[:, slot] = monthly
+        self.slot_years[slot] = year
+        self.appended += 1
+        self.version = next(_versions)
+
+    def appended_years(self):
+        """Years in the window in the order they were appended, oldest first"""
+        filled = min(self.appended, self.window)
+        start = self.appended - filled
+        return [int(self.slot_years[(start + k) % self.window]) for k in range(filled)]
+
+    def concat(self, other):
+        """
+        New normals holding the regions of both; other must cover the same
+        years in the same ring-buffer slots (see extend_climate_normals)
+        """
+        if other.window != self.window or not np.array_equal(other.slot_years, self.slot_years):
+            raise ValueError("Climate normals cover different years")
+        combined = ClimateNormals(self.regions + other.regions, self.window, self.percentile_levels,
+                                  self.states + other.states)
+        for name in ('history', 'count', 'total', 'total_sq', 'sorted_window', 'percentiles'):
+            setattr(combined, name, np.concatenate([getattr(self, name), getattr(other, name)]))
+        if self.shift is not None:
+            combined.shift = np.concatenate([self.shift, other.shift])
+        combined.slot_years = self.slot_years.copy()
+        combined.appended = self.appended
+        combined.version = next(_versions)
+        return combined
+
+    def _window_percentiles(self):
+        """Linearly interpolated percentiles read off the sorted windows"""
+        levels = np.array(self.percentile_levels, dtype=float) / 100
+        position = (self.count[..., None] - 1) * levels
+        lower = np.floor(position).astype(int)
+        upper = np.minimum(lower + 1, self.count[..., None] - 1)
+        low_values = np.take_along_axis(self.sorted_window, np.clip(lower, 0, None), axis=-1)
+        high_values = np.take_along_axis(self.sorted_window, np.clip(upper, 0, None), axis=-1)
+        values = low_values + (high_values - low_values) * (position - lower)
+        return np.where(self.count[..., None] > 0, values, np.nan)
+
+    @property
+    def mean(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.shift + self.total / self.count
+
+    @property
+    def std(self):
+        """Sample standard deviation over the window"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = (self.total_sq - self.total ** 2 / self.count) / (self.count - 1)
+        return np.sqrt(np.clip(variance, 0, None))
+
+    def percentile(self, q):
+        return self.percentiles[..., self.percentile_levels.index(q)]
+
+    def normals(self, region_name):
+        """Monthly mean, std and percentiles of each variable for one region"""
+        row = self.region_index[region_name]
+        mean = self.monthly_normals(region_name)
+        std = self.std[row]
+        return {
+            variable: {
+                'mean': mean[:, k],
+                'std': std[:, k],
+                **{f'p{q}': self.percentiles[row, :, k, j] for j, q in enumerate(self.percentile_levels)}
+            }
+            for k, variable in enumerate(WEATHER_VARIABLES)
+        }
+
+    def monthly_normals(self, region_name):
+        """(months, variables) array of mean monthly weather for one region"""
+        row = self.region_index[region_name]
+        return self.shift[row] + self.total[row] / self.count[row]
+
+    def region_weather(self, region_name):
+        """Weather dict of a region's normal year, shaped like get_weather_data_for_region"""
+        state = self.states[self.region_index[region_name]]
+        return _weather_dict(region_name, self.monthly_normals(region_name), state)
+
+    def history_cube(self, region_names=None, last=None):
+        """
+        Years in the window, oldest first, and the matching (regions, years,
+        months, variables) observations, limited to the last `last` years
+        """
+        rows = slice(None) if region_names is None else [self.region_index[name] for name in region_names]
+        order = np.argsort(self.slot_years)
+        order = order[self.slot_years[order] >= 0]
+        if last is not None:
+            order = order[-last:]
+        return self.slot_years[order].tolist(), self.history[rows][:, order]
+
+    def annual_cube(self, region_names=None, last=None):
+        """
+        Years in the window and (regions, years) arrays of the yearly mean (or
+        total) of each variable, limited to the last `last` years
+        """
+        years, history = self.history_cube(region_names, last)
+        series = {
+            variable: history[..., k].sum(axis=-1) if variable in ANNUAL_TOTALS else history[..., k].mean(axis=-1)
+            for k, variable in enumerate(WEATHER_VARIABLES)
+        }
+        return years, series
+
+    def annual_series(self, region_name):
+        """Years in the window and the yearly mean (or total) of each variable, oldest first"""
+        years, series = self.annual_cube([region_name])
+        return years, {variable: values[0] for variable, values in series.items()}
+
+    def seasonal_normals(self, region_name, seasons):
+        """Mean temperature and total rainfall of each season given as {season: months}"""
+        monthly = self.monthly_normals(region_name)
+        avg_temp = monthly[:, WEATHER_VARIABLES.index('avg_temp')]
+        rainfall = monthly[:, WEATHER_VARIABLES.index('rainfall')]
+        return [
+            {
+                'season': season,
+                'avg_temp': float(avg_temp[np.asarray(months) - 1].mean()),
+                'rainfall': float(rainfall[np.asarray(months) - 1].sum())
+            }
+            for season, months in seasons.items()
+        ]
+
+def _replace_sorted(sorted_window, old, new):
+    """Remove old and insert new into each cell's sorted window along the last axis"""
+    width = sorted_window.shape[-1]
+    old_key = np.where(np.isnan(old), np.inf, old)[..., None]
+    new_key = np.where(np.isnan(new), np.inf, new)[..., None]
+
+    # Drop one occurrence of the retired value
+    drop = np.argmax(sorted_window == old_key, axis=-1)[..., None]
+    index = np.arange(width - 1)
+    remaining = np.take_along_axis(sorted_window, index + (index >= drop), axis=-1)
+
+    # Insert the new value at its rank
+    insert = (remaining < new_key).sum(axis=-1, keepdims=True)
+    index = np.arange(width)
+    source = np.clip(index - (index > insert), 0, width - 2)
+    merged = np.take_along_axis(remaining, source, axis=-1)
+    return np.where(index == insert, new_key, merged)
+
+def build_climate_normals(regions, end_year=None, window=NORMALS_WINDOW, seed=0):
+    """Normals of the synthetic weather of regions over the `window` years up to end_year"""
+    if end_year is None:
+        end_year = datetime.now().year - 1
+    years = list(range(end_year - window + 1, end_year + 1))
+    cube = generate_weather_cube(regions, years, seed)
+    normals = ClimateNormals(regions, window=window)
+    for k, year in enumerate(years):
+        normals.append_year(year, cube.values[:, k])
+    return normals
+
+def build_climate_normals_from_store(store, years, window=NORMALS_WINDOW):
+    """Normals of every block of a weather store over the given years"""
+    normals = ClimateNormals(store.blocks, window=window, states=store.states)
+    for year in years:
+        normals.append_year(year, store.monthly_cube(year))
+    return normals
+
+def extend_climate_normals(normals, regions, seed=0):
+    """
+    Normals with the synthetic weather of regions added over the years in
+    the window; the existing regions, observed or synthetic, are kept as is
+    """
+    years = normals.appended_years()
+    cube = generate_weather_cube(regions, years, seed)
+    added = ClimateNormals(regions, window=normals.window, percentiles=normals.percentile_levels)
+    added.appended = normals.appended - len(years)  # Fill the same ring-buffer slots
+    for k, year in enumerate(years):
+        added.append_year(year, cube.values[:, k])
+    return normals.concat(added)
+
+_climate_normals = None
+
+def set_climate_normals(normals):
+    global _climate_normals
+    _climate_normals = normals
+
+def get_climate_normals(region_names=()):
+    """
+    Shared normals cube; requested regions missing from it are added with
+    synthetic weather, without touching the regions it already holds
+    """
+    global _climate_normals
+    if _climate_normals is None:
+        # Every listed state from the start, so the app's regions never extend the cube
+        states = [state['name'] for state in get_indian_states_data()]
+        _climate_normals = build_climate_normals(list(dict.fromkeys(list(REGIONAL_PATTERNS) + states + list(region_names))))
+    missing = [name for name in dict.fromkeys(region_names) if name not in _climate_normals.region_index]
+    if missing:
+        _climate_normals = extend_climate_normals(_climate_normals, missing)
+    return _climate_normals
@@ -1,6 +1,22 @@
+import warnings
 import pandas as pd
+import numpy as np
+from collections.abc import Mapping
+from types import MappingProxyType
 
-def get_crop_database():
+# Per-crop attributes stored as float columns in the catalog
+NUMERIC_COLUMNS = (
+    'temp_min', 'temp_max',
+    'rainfall_min', 'rainfall_max',
+    'soil_ph_min', 'soil_ph_max',
+    'market_price', 'production_cost', 'expected_yield',
+    'growing_period_days'
+)
+
+# Free-text attributes kept alongside the numeric columns
+TEXT_COLUMNS = ('name', 'type', 'growing_season', 'water_requirement')
+
+def _base_crop_records():
     """
     Returns a comprehensive database of crops with their growing requirements
     and economic data based on Indian agricultural patterns.
@@ -225,26 +241,327 @@ def get_crop_database():
         }
     ]
     
-    # Add calculated fields
-    for crop in crops_data:
-        revenue = crop['expected_yield'] * crop['market_price']
-        profit = revenue - crop['production_cost']
-        crop['profit_margin'] = (profit / revenue) * 100 if revenue > 0 else 0
-        crop['roi'] = (profit / crop['production_cost']) * 100 if crop['production_cost'] > 0 else 0
-    
     return crops_data
 
+_catalog_version = 0
+
+MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+          'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+# Cropping seasons as bit flags, with the months each one spans by default
+SEASON_FLAGS = {'Kharif': 1, 'Rabi': 2, 'Zaid': 4}
+SEASON_MONTHS = {
+    'Kharif': (6, 7, 8, 9, 10),  # Jun-Oct
+    'Rabi': (10, 11, 12, 1, 2, 3),  # Oct-Mar
+    'Zaid': (3, 4, 5, 6)  # Mar-Jun
+}
+SEASON_ALIASES = {
+    'kharif': 'Kharif', 'monsoon': 'Kharif',
+    'rabi': 'Rabi', 'winter': 'Rabi',
+    'zaid': 'Zaid', 'summer': 'Zaid'
+}
+YEAR_ROUND_SEASONS = ('all seasons', 'all year', 'year-round', 'year round', 'perennial')
+ALL_SEASONS = sum(SEASON_FLAGS.values())
+ALL_MONTHS = (1 << 12) - 1
+
+def months_to_mask(months):
+    """12-bit mask of calendar months (1-12); bit 0 is January"""
+    mask = 0
+    for month in months:
+        mask |= 1 << (month - 1)
+    return mask
+
+def month_span_mask(start, end):
+    """Mask of the months from start to end inclusive, wrapping past December"""
+    return months_to_mask(((start - 1 + i) % 12) + 1 for i in range((end - start) % 12 + 1))
+
+def parse_growing_season(growing_season):
+    """
+    Parse a free-text growing season such as 'Rabi (Nov-Apr)' or 'Kharif/Summer'
+    into (season flags, month mask). Explicit month spans override the
+    season's default months; year-round crops get every season and month,
+    as do spans whose months are not recognised (with a warning).
+    """
+    flags, months = 0, 0
+    for part in growing_season.split('/'):
+        name, _, span = part.partition('(')
+        name = name.strip().lower()
+        if name in YEAR_ROUND_SEASONS:
+            return ALL_SEASONS, ALL_MONTHS
+
+        season = SEASON_ALIASES.get(name)
+        if season is None:
+            continue
+        flags |= SEASON_FLAGS[season]
+
+        span = span.strip(') ')
+        if '-' in span:
+            try:
+                start, end = (MONTHS.index(month.strip()[:3].title()) + 1 for month in span.split('-'))
+            except ValueError:
+                warnings.warn(f"Unrecognised months in growing season {growing_season!r}; assuming all months")
+                months |= ALL_MONTHS
+                continue
+            months |= month_span_mask(start, end)
+        else:
+            months |= months_to_mask(SEASON_MONTHS[season])
+
+    return flags, months
+
+def _season_flag(season):
+    """Bit flag of a season name or alias, 0 if unknown"""
+    return SEASON_FLAGS.get(SEASON_ALIASES.get(season.lower()), 0)
+
+class CropScore(Mapping):
+    """
+    Per-request scoring result: references a frozen catalog record and reads
+    like the crop dict, with the request's scores layered on top
+    """
+
+    __slots__ = ('record', 'scores')
+
+    def __init__(self, record, scores):
+        self.record = record
+        self.scores = scores
+
+    def __getitem__(self, key):
+        if key in self.scores:
+            return self.scores[key]
+        return self.record[key]
+
+    def __iter__(self):
+        yield from self.record
+        yield from (key for key in self.scores if key not in self.record)
+
+    def __len__(self):
+        return len(self.record) + sum(1 for key in self.scores if key not in self.record)
+
+    def __repr__(self):
+        return f"CropScore({self.record['name']!r}, {self.scores!r})"
+
+class CropCatalog:
+    """
+    Columnar crop catalog: one NumPy array per attribute, built once, so that
+    suitability checks run as array expressions over every crop at once
+    """
+
+    def __init__(self, records):
+        self.columns = {}
+        for key in NUMERIC_COLUMNS:
+            self.columns[key] = np.array([crop[key] for crop in records], dtype=float)
+        for key in TEXT_COLUMNS:
+            self.columns[key] = np.array([crop[key] for crop in records], dtype=object)
+
+        # Growing seasons parsed once into season flags and 12-bit month masks
+        seasons = [parse_growing_season(crop['growing_season']) for crop in records]
+        self.columns['season_flags'] = np.array([flags for flags, _ in seasons], dtype=np.uint8)
+        self.columns['season_months'] = np.array([months for _, months in seasons], dtype=np.uint16)
+
+        # Add calculated fields
+        revenue = self.columns['expected_yield'] * self.columns['market_price']
+        cost = self.columns['production_cost']
+        profit = revenue - cost
+        self.columns['profit_margin'] = np.divide(profit, revenue, out=np.zeros_like(profit), where=revenue > 0) * 100
+        self.columns['roi'] = np.divide(profit, cost, out=np.zeros_like(profit), where=cost > 0) * 100
+
+        for column in self.columns.values():
+            column.flags.writeable = False
+
+        # Frozen records, safe to share across requests and sessions
+        self.records = tuple(
+            MappingProxyType(dict(crop, profit_margin=margin, roi=roi))
+            for crop, margin, roi in zip(records, self.columns['profit_margin'].tolist(), self.columns['roi'].tolist())
+        )
+
+        self._interval_index = None
+
+        # Hash indexes for lookups by name, type and season
+        self.name_index = {crop['name']: i for i, crop in enumerate(self.records)}
+        self.type_index = {}
+        for i, crop in enumerate(self.records):
+            self.type_index.setdefault(crop['type'], []).append(i)
+        self.season_index = {
+            season: np.flatnonzero(self.season_mask(season)).tolist() for season in SEASON_FLAGS
+        }
+
+        global _catalog_version
+        _catalog_version += 1
+        self.version = _catalog_version
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, name):
+        """Record of a crop by name, or None"""
+        index = self.name_index.get(name)
+        return None if index is None else self.records[index]
+
+    def lookup_many(self, names):
+        """Records for several crop names at once (None for unknown names)"""
+        return [self.get(name) for name in names]
+
+    def by_type(self, crop_type):
+        """Records of a crop type"""
+        return [self.records[i] for i in self.type_index.get(crop_type, [])]
+
+    def by_season(self, season):
+        """Records grown in a season, e.g. 'Kharif' (aliases like 'Summer' accepted)"""
+        return [self.records[i] for i in self.season_index.get(SEASON_ALIASES.get(season.lower()), [])]
+
+    def season_mask(self, season):
+        """Boolean mask of the crops grown in a season"""
+        return (self.columns['season_flags'] & _season_flag(season)) != 0
+
+    def month_mask(self, month):
+        """Boolean mask of the crops in the field during a calendar month (1-12)"""
+        return (self.columns['season_months'] & (1 << (month - 1))) != 0
+
+    def crops_for_month(self, month):
+        """Records of the crops in the field during a calendar month (1-12)"""
+        return [self.records[i] for i in np.flatnonzero(self.month_mask(month))]
+
+    def score(self, index, **scores):
+        """Wrap a catalog record with per-request scores"""
+        return CropScore(self.records[index], scores)
+
+    def climate_suitability(self, temp_range, rainfall_range, soil_ph=6.5):
+        """
+        Compatibility mask and suitability score for every crop.
+        Range bounds may be scalars or equal-length arrays (one entry per query),
+        in which case the results have shape (queries, crops).
+        """
+        min_temp, max_temp = (np.asarray(v, dtype=float)[..., None] for v in temp_range)
+        min_rainfall, max_rainfall = (np.asarray(v, dtype=float)[..., None] for v in rainfall_range)
+        soil_ph = np.asarray(soil_ph, dtype=float)[..., None]
+        c = self.columns
+
+        temp_compatible = (c['temp_min'] <= max_temp) & (c['temp_max'] >= min_temp)
+        rainfall_compatible = (c['rainfall_min'] <= max_rainfall) & (c['rainfall_max'] >= min_rainfall)
+        ph_compatible = (c['soil_ph_min'] <= soil_ph) & (soil_ph <= c['soil_ph_max'])
+        mask = temp_compatible & rainfall_compatible & ph_compatible
+
+        return mask, self.climate_scores((min_temp, max_temp), (min_rainfall, max_rainfall))
+
+    def climate_scores(self, temp_range, rainfall_range, indices=None):
+        """Suitability score (0-10) of every crop, or of the crops at indices"""
+        min_temp, max_temp = temp_range
+        min_rainfall, max_rainfall = rainfall_range
+        c = self.columns
+        if indices is None:
+            indices = slice(None)
+
+        temp_mid = (c['temp_min'][indices] + c['temp_max'][indices]) / 2
+        rainfall_mid = (c['rainfall_min'][indices] + c['rainfall_max'][indices]) / 2
+        temp_score = 10 - np.abs(temp_mid - (min_temp + max_temp)/2) / 5
+        rainfall_score = 10 - np.abs(rainfall_mid - (min_rainfall + max_rainfall)/2) / 200
+
+        return (np.clip(temp_score, 0, 10) + np.clip(rainfall_score, 0, 10)) / 2
+
+    @property
+    def interval_index(self):
+        """Range index over the temperature, rainfall and pH requirement intervals"""
+        if self._interval_index is None:
+            self._interval_index = CropIntervalIndex(self.columns)
+        return self._interval_index
+
+class CropIntervalIndex:
+    """
+    Sorted-endpoint index over crop requirement intervals.
+    A climate query is six one-sided bounds (e.g. temp_min <= max_temp); each
+    bound selects a contiguous run of one sorted endpoint array, found by
+    binary search. Only the shortest run is scanned against the other bounds,
+    so a query touches O(log n + k) crops instead of all n.
+    """
+
+    # (column, side): 'upper' keeps crops with column <= query value, 'lower' those with column >= value
+    BOUNDS = (
+        ('temp_min', 'upper'), ('temp_max', 'lower'),
+        ('rainfall_min', 'upper'), ('rainfall_max', 'lower'),
+        ('soil_ph_min', 'upper'), ('soil_ph_max', 'lower')
+    )
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.order = {}
+        self.sorted_values = {}
+        for column, _ in self.BOUNDS:
+            order = np.argsort(columns[column], kind='stable')
+            self.order[column] = order
+            self.sorted_values[column] = columns[column][order]
+
+    def query(self, temp_range, rainfall_range, soil_ph=6.5):
+        """Catalog indices (ascending) of crops overlapping the given climate"""
+        return self.query_batch([temp_range[0]], [temp_range[1]], [rainfall_range[0]], [rainfall_range[1]], [soil_ph])[0]
+
+    def query_batch(self, min_temp, max_temp, min_rainfall, max_rainfall, soil_ph):
+        """
+        Candidate sets for many climate queries at once (one entry per query in
+        each argument); returns a list of ascending catalog index arrays
+        """
+        values = [
+            np.asarray(v, dtype=float)
+            for v in (max_temp, min_temp, max_rainfall, min_rainfall, soil_ph, soil_ph)
+        ]
+        n = len(self.columns['name'])
+
+        # Run of each bound in its sorted array: [start, stop)
+        starts, stops = [], []
+        for (column, side), value in zip(self.BOUNDS, values):
+            if side == 'upper':
+                starts.append(np.zeros(len(value), dtype=int))
+                stops.append(np.searchsorted(self.sorted_values[column], value, side='right'))
+            else:
+                starts.append(np.searchsorted(self.sorted_values[column], value, side='left'))
+                stops.append(np.full(len(value), n))
+        starts, stops = np.stack(starts, axis=1), np.stack(stops, axis=1)
+        best = np.argmin(stops - starts, axis=1)
+
+        results = []
+        for q, b in enumerate(best.tolist()):
+            column = self.BOUNDS[b][0]
+            candidates = self.order[column][starts[q, b]:stops[q, b]]
+            keep = np.ones(len(candidates), dtype=bool)
+            for (other, side), value in zip(self.BOUNDS, values):
+                if other == column:
+                    continue
+                bound = self.columns[other][candidates]
+                keep &= (bound <= value[q]) if side == 'upper' else (bound >= value[q])
+            results.append(np.sort(candidates[keep]))
+
+        return results
+
+_crop_catalog = None
+
+def get_crop_catalog():
+    """Get the shared columnar crop catalog, building it on first use"""
+    global _crop_catalog
+    if _crop_catalog is None:
+        _crop_catalog = CropCatalog(_base_crop_records())
+    return _crop_catalog
+
+def load_crop_catalog(records):
+    """Replace the shared catalog, e.g. with a variety-level crop list"""
+    global _crop_catalog
+    _crop_catalog = CropCatalog(records)
+    return _crop_catalog
+
+def get_crop_database():
+    """
+    Returns a comprehensive database of crops with their growing requirements
+    and economic data based on Indian agricultural patterns.
+    Records are shared and read-only.
+    """
+    return list(get_crop_catalog().records)
+
 def get_crop_by_name(crop_name):
     """Get specific crop data by name"""
-    crops = get_crop_database()
-    return next((crop for crop in crops if crop['name'] == crop_name), None)
+    return get_crop_catalog().get(crop_name)
 
 def get_crops_by_type(crop_type):
     """Get crops filtered by type"""
-    crops = get_crop_database()
     if crop_type == "All":
-        return crops
-    return [crop for crop in crops if crop['type'] == crop_type]
+        return get_crop_database()
+    return get_crop_catalog().by_type(crop_type)
 
 def get_suitable_crops_for_climate(temp_range, rainfall_range, soil_ph=6.5):
     """
@@ -252,31 +569,13 @@ def get_suitable_crops_for_climate(temp_range, rainfall_range, soil_ph=6.5):
     temp_range: (min_temp, max_temp)
     rainfall_range: (min_rainfall, max_rainfall)
     """
-    crops = get_crop_database()
-    suitable_crops = []
-    
-    min_temp, max_temp = temp_range
-    min_rainfall, max_rainfall = rainfall_range
-    
-    for crop in crops:
-        # Check temperature compatibility
-        temp_compatible = (crop['temp_min'] <= max_temp and crop['temp_max'] >= min_temp)
-        
-        # Check rainfall compatibility
-        rainfall_compatible = (crop['rainfall_min'] <= max_rainfall and crop['rainfall_max'] >= min_rainfall)
-        
-        # Check soil pH compatibility
-        ph_compatible = (crop['soil_ph_min'] <= soil_ph <= crop['soil_ph_max'])
-        
-        if temp_compatible and rainfall_compatible and ph_compatible:
-            # Calculate suitability score
-            temp_score = 10 - abs((crop['temp_min'] + crop['temp_max'])/2 - (min_temp + max_temp)/2) / 5
-            rainfall_score = 10 - abs((crop['rainfall_min'] + crop['rainfall_max'])/2 - (min_rainfall + max_rainfall)/2) / 200
-            
-            temp_score = max(0, min(10, temp_score))
-            rainfall_score = max(0, min(10, rainfall_score))
-            
-            crop['suitability_score'] = (temp_score + rainfall_score) / 2
-            suitable_crops.append(crop)
-    
-    return sorted(suitable_crops, key=lambda x: x['suitability_score'], reverse=True)
+    catalog = get_crop_catalog()
+    suitable = catalog.interval_index.query(temp_range, rainfall_range, soil_ph)
+    scores = catalog.climate_scores(temp_range, rainfall_range, suitable)
+
+    order = np.argsort(-scores, kind='stable')
+
+    return [
+        catalog.score(index, suitability_score=score)
+        for index, score in zip(suitable[order].tolist(), scores[order].tolist())
+    ]
@@ -0,0 +1,92 @@
+import sys
+from collections.abc import Mapping
+
+# Shared instances of repeated values (category names, crop lists, ranges)
+_interned = {}
+
+def intern_value(value):
+    """
+    One shared instance per distinct string or list of strings; lists
+    become tuples, so records never share mutable state. Numeric lists
+    (ranges of measurements) are converted but not pooled.
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, (list, tuple)):
+        value = tuple(intern_value(item) for item in value)
+        if all(isinstance(item, str) for item in value):
+            value = _interned.setdefault(value, value)
+    return value
+
+class Record(Mapping):
+    """
+    Read-only, slotted record with dict-style access (record['name'],
+    .get, .items, dict(record), {**record}). Fields never given are absent
+    rather than None, so record.get(key, default) behaves like a dict;
+    keys outside the record's fields are kept in a small side dict.
+    """
+
+    __slots__ = ('_extra',)
+    _fields = ()
+
+    def __init__(self, values=(), **fields):
+        extra = None
+        for key, value in dict(values, **fields).items():
+            if key in self._fields:
+                object.__setattr__(self, key, intern_value(value))
+            else:
+                extra = extra or {}
+                extra[intern_value(key)] = intern_value(value)
+        object.__setattr__(self, '_extra', extra)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        for key in self._fields:
+            if hasattr(self, key):
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+    def replace(self, **fields):
+        """Copy of the record with some values changed"""
+        return type(self)(self, **fields)
+
+class RegionRecord(Record):
+    """State/region with its coordinates and agricultural characteristics"""
+    _fields = ('name', 'lat', 'lon', 'climate_zone', 'soil_type', 'annual_rainfall',
+               'temp_range', 'major_crops', 'agricultural_zone')
+    __slots__ = _fields
+
+class LocationRecord(Record):
+    """Block, district or state centre on the map"""
+    _fields = ('name', 'kind', 'state', 'district', 'lat', 'lon')
+    __slots__ = _fields
+
+class SoilProfile(Record):
+    """Soil characteristics of a region, district or farm"""
+    _fields = ('primary_soil', 'secondary_soils', 'ph_range', 'organic_matter',
+               'nitrogen', 'phosphorus', 'potassium', 'drainage', 'erosion_risk',
+               'salinity_level', 'soil_depth', 'water_holding_capacity',
+               'texture_class', 'cec', 'bulk_density')
+    __slots__ = _fields
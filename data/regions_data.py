@@ -1,9 +1,6 @@
-def get_indian_states_data():
-    """
-    Returns data for major Indian states/regions with their coordinates,
-    climate zones, and agricultural characteristics
-    """
-    
+from data.records import RegionRecord, LocationRecord
+
+def _base_states_data():
     regions = [
         {
             'name': 'Punjab',
@@ -174,11 +171,20 @@ def get_indian_states_data():
     
     return regions
 
-def get_district_coordinates(state_name):
+_states = None
+
+def get_indian_states_data():
     """
-    Get coordinates for major districts within a state
+    Returns data for major Indian states/regions with their coordinates,
+    climate zones, and agricultural characteristics, as read-only records
+    built once and shared by every caller
     """
-    
+    global _states
+    if _states is None:
+        _states = tuple(RegionRecord(region) for region in _base_states_data())
+    return list(_states)
+
+def _base_district_data():
     district_data = {
         'Punjab': [
             {'name': 'Ludhiana', 'lat': 30.901, 'lon': 75.857},
@@ -200,7 +206,21 @@ def get_district_coordinates(state_name):
         ]
     }
     
-    return district_data.get(state_name, [])
+    return district_data
+
+_districts = None
+
+def get_district_coordinates(state_name):
+    """
+    Get coordinates for major districts within a state
+    """
+    global _districts
+    if _districts is None:
+        _districts = {
+            state: tuple(LocationRecord(district, kind='district', state=state) for district in districts)
+            for state, districts in _base_district_data().items()
+        }
+    return list(_districts.get(state_name, ()))
 
 def get_agro_climatic_zones():
     """
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
+from data.crop_database import months_to_mask
 
 def get_crop_calendar_data():
     """
@@ -304,6 +305,23 @@ def get_regional_calendar(region_name: str, year: Optional[int] = None) -> Dict:
     
     return regional_calendar
 
+def get_calendar_month_masks(regional_calendar: Dict):
+    """
+    Planting and harvesting months of every crop in a regional calendar as
+    12-bit masks (bit 0 = January), for vectorized month lookups.
+    Returns (crop names, planting masks, harvesting masks) arrays.
+    """
+    crop_names = np.array(list(regional_calendar), dtype=object)
+    planting_masks = np.zeros(len(crop_names), dtype=np.uint16)
+    harvesting_masks = np.zeros(len(crop_names), dtype=np.uint16)
+    
+    for i, crop_data in enumerate(regional_calendar.values()):
+        for season_data in crop_data.get('seasons', {}).values():
+            planting_masks[i] |= months_to_mask(season_data.get('planting_months', []))
+            harvesting_masks[i] |= months_to_mask(season_data.get('harvesting_months', []))
+    
+    return crop_names, planting_masks, harvesting_masks
+
 def get_optimal_planting_dates(months: List[int], year: int) -> List[Dict]:
     """
     Get optimal planting date ranges for given months
@@ -1,8 +1,13 @@
 import pandas as pd
 import numpy as np
+import zlib
+from collections.abc import Mapping
+from functools import lru_cache
 from typing import Dict, List, Optional
+from data.crop_database import get_crop_catalog
+from data.records import SoilProfile
 
-def get_detailed_soil_data():
+def _base_soil_data():
     """
     Returns comprehensive soil data for Indian regions with detailed analysis
     """
@@ -182,71 +187,137 @@ def get_detailed_soil_data():
     
     return soil_data
 
-def analyze_soil_crop_compatibility(crop_requirements: Dict, soil_data: Dict) -> Dict:
+_soil_data = None
+_soil_data_version = 0
+
+def get_detailed_soil_data():
     """
-    Analyze compatibility between crop requirements and soil characteristics
+    Returns comprehensive soil data for Indian regions with detailed analysis;
+    profiles are read-only records shared between callers
     """
-    
-    # Extract crop soil requirements
-    crop_ph_min = crop_requirements.get('soil_ph_min', 6.0)
-    crop_ph_max = crop_requirements.get('soil_ph_max', 7.5)
-    crop_water_req = crop_requirements.get('water_requirement', 'Medium')
-    crop_type = crop_requirements.get('type', 'Cereals')
-    
-    # Extract soil characteristics
-    soil_ph_range = soil_data['ph_range']
-    soil_drainage = soil_data['drainage']
-    soil_water_capacity = soil_data['water_holding_capacity']
-    soil_nutrients = {
-        'N': soil_data['nitrogen'],
-        'P': soil_data['phosphorus'],
-        'K': soil_data['potassium']
-    }
-    
-    # Calculate pH compatibility score (0-10)
-    soil_ph_avg = sum(soil_ph_range) / 2
-    crop_ph_optimal = (crop_ph_min + crop_ph_max) / 2
-    ph_deviation = abs(soil_ph_avg - crop_ph_optimal)
-    ph_score = max(0, 10 - ph_deviation * 2)
-    
-    # Calculate water compatibility score
-    water_compatibility = {
-        'High': {'Excellent': 7, 'Good': 9, 'Moderate': 6, 'Poor': 4},
-        'Medium': {'Excellent': 8, 'Good': 10, 'Moderate': 8, 'Poor': 5},
-        'Low': {'Excellent': 6, 'Good': 8, 'Moderate': 9, 'Poor': 10}
+    global _soil_data
+    if _soil_data is None:
+        _soil_data = {region: SoilProfile(profile) for region, profile in _base_soil_data().items()}
+    return dict(_soil_data)
+
+def _region_soil_profile(region_name: str) -> Dict:
+    """Shared (read-only) soil profile of a region, or an empty dict"""
+    if _soil_data is None:
+        get_detailed_soil_data()
+    return _soil_data.get(region_name, {})
+
+def set_region_soil_data(region_name: str, profile: Dict) -> None:
+    """Add or replace a region's soil profile; invalidates the compatibility matrix"""
+    global _soil_data_version
+    get_detailed_soil_data()
+    _soil_data[region_name] = SoilProfile(profile)
+    _soil_data_version += 1
+
+# Calculate water compatibility score
+WATER_COMPATIBILITY = {
+    'High': {'Excellent': 7, 'Good': 9, 'Moderate': 6, 'Poor': 4},
+    'Medium': {'Excellent': 8, 'Good': 10, 'Moderate': 8, 'Poor': 5},
+    'Low': {'Excellent': 6, 'Good': 8, 'Moderate': 9, 'Poor': 10}
+}
+
+# Calculate nutrient score
+NUTRIENT_LEVELS = {'Very Low': 1, 'Low': 3, 'Medium': 6, 'High': 9, 'Very High': 10}
+
+# Different crops have different nutrient requirements
+CROP_NUTRIENT_NEEDS = {
+    'Cereals': {'N': 8, 'P': 6, 'K': 7},
+    'Pulses': {'N': 4, 'P': 8, 'K': 6},  # Legumes fix nitrogen
+    'Oilseeds': {'N': 7, 'P': 8, 'K': 8},
+    'Vegetables': {'N': 9, 'P': 8, 'K': 8},
+    'Fruits': {'N': 7, 'P': 7, 'K': 9}
+}
+
+# Calculate erosion risk impact
+EROSION_RISK_IMPACT = {
+    'Low': 10, 'Medium': 7, 'High': 4, 'Very High': 2
+}
+
+# Ordinal codes of the categorical soil and crop attributes; each category
+# list ends in an implicit "unknown" code that maps to the default score
+NUTRIENT_CATEGORIES = tuple(NUTRIENT_LEVELS)
+DRAINAGE_CATEGORIES = ('Excellent', 'Good', 'Moderate', 'Poor')
+WATER_REQUIREMENT_CATEGORIES = tuple(WATER_COMPATIBILITY)
+EROSION_CATEGORIES = tuple(EROSION_RISK_IMPACT)
+WATER_HOLDING_CATEGORIES = ('Very Low', 'Low', 'Medium', 'High', 'Very High')
+CROP_TYPE_CATEGORIES = tuple(CROP_NUTRIENT_NEEDS)
+
+# Score lookup tables indexed by ordinal code
+NUTRIENT_LEVEL_TABLE = np.array([NUTRIENT_LEVELS[level] for level in NUTRIENT_CATEGORIES] + [5], dtype=float)
+WATER_SCORE_TABLE = np.array([
+    [WATER_COMPATIBILITY[requirement][drainage] for drainage in DRAINAGE_CATEGORIES] + [5]
+    for requirement in WATER_REQUIREMENT_CATEGORIES
+] + [[5] * (len(DRAINAGE_CATEGORIES) + 1)], dtype=float)
+EROSION_SCORE_TABLE = np.array([EROSION_RISK_IMPACT[risk] for risk in EROSION_CATEGORIES] + [5], dtype=float)
+CROP_NEEDS_TABLE = np.array([
+    [CROP_NUTRIENT_NEEDS[crop_type][n] for n in ('N', 'P', 'K')]
+    for crop_type in CROP_TYPE_CATEGORIES
+] + [[7, 7, 7]], dtype=float)
+
+# Lower score bounds of the suitability grades, for np.digitize
+GRADE_BOUNDS = np.array([4.0, 5.5, 7.0, 8.5])
+SUITABILITY_GRADES = np.array(['Unsuitable', 'Poor', 'Fair', 'Good', 'Excellent'], dtype=object)
+# Grade of scores that could not be computed (NaN)
+UNKNOWN_GRADE = 'Unknown'
+
+def _ordinal(values, categories) -> np.ndarray:
+    """Ordinal codes of values, len(categories) for anything unknown"""
+    codes = {category: code for code, category in enumerate(categories)}
+    return np.array([codes.get(value, len(categories)) for value in values], dtype=np.uint8)
+
+def encode_soil_profiles(profiles) -> Dict[str, np.ndarray]:
+    """Soil profiles (a sequence of dicts) as ordinal-encoded column arrays"""
+    profiles = list(profiles)
+    return {
+        'ph': np.array([sum(profile['ph_range']) / 2 for profile in profiles], dtype=float),
+        'nutrients': np.stack([
+            _ordinal([profile[key] for profile in profiles], NUTRIENT_CATEGORIES)
+            for key in ('nitrogen', 'phosphorus', 'potassium')
+        ], axis=-1).reshape(len(profiles), 3),
+        'drainage': _ordinal([profile['drainage'] for profile in profiles], DRAINAGE_CATEGORIES),
+        'erosion_risk': _ordinal([profile['erosion_risk'] for profile in profiles], EROSION_CATEGORIES),
+        'water_holding_capacity': _ordinal(
+            [profile.get('water_holding_capacity') for profile in profiles], WATER_HOLDING_CATEGORIES
+        )
     }
-    
-    water_score = water_compatibility.get(crop_water_req, {}).get(soil_drainage, 5)
-    
-    # Calculate nutrient score
-    nutrient_levels = {'Very Low': 1, 'Low': 3, 'Medium': 6, 'High': 9, 'Very High': 10}
-    
-    # Different crops have different nutrient requirements
-    crop_nutrient_needs = {
-        'Cereals': {'N': 8, 'P': 6, 'K': 7},
-        'Pulses': {'N': 4, 'P': 8, 'K': 6},  # Legumes fix nitrogen
-        'Oilseeds': {'N': 7, 'P': 8, 'K': 8},
-        'Vegetables': {'N': 9, 'P': 8, 'K': 8},
-        'Fruits': {'N': 7, 'P': 7, 'K': 9}
+
+def encode_crop_requirements(crops) -> Dict[str, np.ndarray]:
+    """Crop soil requirements (a sequence of dicts) as ordinal-encoded column arrays"""
+    crops = list(crops)
+    return {
+        'ph_optimal': np.array([
+            (crop.get('soil_ph_min', 6.0) + crop.get('soil_ph_max', 7.5)) / 2 for crop in crops
+        ], dtype=float),
+        'water_requirement': _ordinal(
+            [crop.get('water_requirement', 'Medium') for crop in crops], WATER_REQUIREMENT_CATEGORIES
+        ),
+        'type': _ordinal([crop.get('type', 'Cereals') for crop in crops], CROP_TYPE_CATEGORIES)
     }
+
+def soil_compatibility_kernel(soils: Dict[str, np.ndarray], crops: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Component and overall scores of every soil x crop pair from encoded
+    arrays: overall (S, C), components (S, C, 4) in SOIL_COMPONENTS order
+    and nutrient_scores (S, C, 3) in N, P, K order
+    """
+    # pH compatibility score (0-10)
+    ph_deviation = np.abs(soils['ph'][:, None] - crops['ph_optimal'][None, :])
+    ph_score = np.maximum(0, 10 - ph_deviation * 2)
     
-    crop_needs = crop_nutrient_needs.get(crop_type, {'N': 7, 'P': 7, 'K': 7})
-    
-    nutrient_scores = {}
-    for nutrient, need in crop_needs.items():
-        soil_level = nutrient_levels.get(soil_nutrients[nutrient], 5)
-        # Score based on how well soil level matches crop need
-        nutrient_scores[nutrient] = max(0, 10 - abs(soil_level - need))
+    water_score = WATER_SCORE_TABLE[crops['water_requirement'][None, :], soils['drainage'][:, None]]
     
-    avg_nutrient_score = sum(nutrient_scores.values()) / len(nutrient_scores)
+    # Score based on how well soil level matches crop need
+    soil_levels = NUTRIENT_LEVEL_TABLE[soils['nutrients']]
+    crop_needs = CROP_NEEDS_TABLE[crops['type']]
+    nutrient_scores = np.maximum(0, 10 - np.abs(soil_levels[:, None, :] - crop_needs[None, :, :]))
+    avg_nutrient_score = (nutrient_scores[..., 0] + nutrient_scores[..., 1] + nutrient_scores[..., 2]) / 3
     
-    # Calculate erosion risk impact
-    erosion_risk_impact = {
-        'Low': 10, 'Medium': 7, 'High': 4, 'Very High': 2
-    }
-    erosion_score = erosion_risk_impact.get(soil_data['erosion_risk'], 5)
+    erosion_score = np.broadcast_to(EROSION_SCORE_TABLE[soils['erosion_risk']][:, None], ph_score.shape)
     
-    # Calculate overall soil suitability score
     overall_score = (
         ph_score * 0.25 +
         water_score * 0.30 +
@@ -254,196 +325,437 @@ def analyze_soil_crop_compatibility(crop_requirements: Dict, soil_data: Dict) ->
         erosion_score * 0.15
     )
     
-    # Generate recommendations
+    return {
+        'overall': overall_score,
+        'components': np.stack([ph_score, water_score, avg_nutrient_score, erosion_score], axis=-1),
+        'nutrient_scores': nutrient_scores
+    }
+
+def suitability_grades(scores) -> np.ndarray:
+    """Grade of every score, as get_suitability_grade"""
+    scores = np.asarray(scores, dtype=float)
+    return np.where(np.isfinite(scores), SUITABILITY_GRADES[np.digitize(scores, GRADE_BOUNDS)], UNKNOWN_GRADE)
+
+def _compatibility_scores(crop_requirements: Dict, soil_data: Dict) -> Dict:
+    """Unrounded component scores of a crop-soil pair"""
+    scores = soil_compatibility_kernel(
+        encode_soil_profiles([soil_data]), encode_crop_requirements([crop_requirements])
+    )
+    ph_score, water_score, avg_nutrient_score, erosion_score = scores['components'][0, 0].tolist()
+    
+    return {
+        'overall': float(scores['overall'][0, 0]),
+        'ph': ph_score,
+        'water': water_score,
+        'nutrient': avg_nutrient_score,
+        'erosion': erosion_score,
+        'nutrient_scores': dict(zip(('N', 'P', 'K'), scores['nutrient_scores'][0, 0].tolist()))
+    }
+
+def _compatibility_recommendations(crop_requirements: Dict, soil_data: Dict, scores: Dict) -> List[str]:
+    """Generate recommendations for a crop-soil pair from its component scores"""
+    crop_ph_optimal = (crop_requirements.get('soil_ph_min', 6.0) + crop_requirements.get('soil_ph_max', 7.5)) / 2
+    crop_water_req = crop_requirements.get('water_requirement', 'Medium')
+    soil_ph_avg = sum(soil_data['ph_range']) / 2
+    soil_drainage = soil_data['drainage']
+    
     recommendations = []
     
-    if ph_score < 6:
+    if scores['ph'] < 6:
         if soil_ph_avg > crop_ph_optimal:
             recommendations.append("Apply organic matter or sulfur to reduce soil pH")
         else:
             recommendations.append("Apply lime to increase soil pH")
     
-    if water_score < 6:
+    if scores['water'] < 6:
         if crop_water_req == 'High' and soil_drainage == 'Poor':
             recommendations.append("Improve drainage through better field preparation")
         elif crop_water_req == 'Low' and soil_drainage == 'Excellent':
             recommendations.append("Consider water conservation techniques or mulching")
     
-    if avg_nutrient_score < 6:
-        low_nutrients = [n for n, score in nutrient_scores.items() if score < 6]
+    if scores['nutrient'] < 6:
+        low_nutrients = [n for n, score in scores['nutrient_scores'].items() if score < 6]
         if low_nutrients:
             recommendations.append(f"Apply fertilizers rich in {', '.join(low_nutrients)}")
     
-    if erosion_score < 7:
+    if scores['erosion'] < 7:
         recommendations.append("Implement erosion control measures like contour farming")
     
+    return recommendations
+
+def _detailed_analysis(crop_requirements: Dict, soil_data: Dict, nutrient_scores: Dict) -> Dict:
+    crop_water_req = crop_requirements.get('water_requirement', 'Medium')
+    return {
+        'soil_ph_range': soil_data['ph_range'],
+        'crop_ph_requirement': [crop_requirements.get('soil_ph_min', 6.0), crop_requirements.get('soil_ph_max', 7.5)],
+        'nutrient_scores': {k: round(v, 2) for k, v in nutrient_scores.items()},
+        'water_match': f"Crop needs {crop_water_req} water, soil has {soil_data['drainage']} drainage"
+    }
+
+def analyze_soil_crop_compatibility(crop_requirements: Dict, soil_data: Dict) -> Dict:
+    """
+    Analyze compatibility between crop requirements and soil characteristics
+    """
+    scores = _compatibility_scores(crop_requirements, soil_data)
+    
     return {
-        'overall_score': round(overall_score, 2),
+        'overall_score': round(scores['overall'], 2),
         'component_scores': {
-            'ph_compatibility': round(ph_score, 2),
-            'water_compatibility': round(water_score, 2),
-            'nutrient_adequacy': round(avg_nutrient_score, 2),
-            'erosion_risk': round(erosion_score, 2)
+            'ph_compatibility': round(scores['ph'], 2),
+            'water_compatibility': round(scores['water'], 2),
+            'nutrient_adequacy': round(scores['nutrient'], 2),
+            'erosion_risk': round(scores['erosion'], 2)
         },
-        'detailed_analysis': {
-            'soil_ph_range': soil_ph_range,
-            'crop_ph_requirement': [crop_ph_min, crop_ph_max],
-            'nutrient_scores': {k: round(v, 2) for k, v in nutrient_scores.items()},
-            'water_match': f"Crop needs {crop_water_req} water, soil has {soil_drainage} drainage"
-        },
-        'recommendations': recommendations,
-        'suitability_grade': get_suitability_grade(overall_score)
+        'detailed_analysis': _detailed_analysis(crop_requirements, soil_data, scores['nutrient_scores']),
+        'recommendations': _compatibility_recommendations(crop_requirements, soil_data, scores),
+        'suitability_grade': get_suitability_grade(scores['overall'])
     }
 
-def get_suitability_grade(score: float) -> str:
-    """Convert numerical score to grade"""
-    if score >= 8.5:
-        return 'Excellent'
-    elif score >= 7.0:
-        return 'Good'
-    elif score >= 5.5:
-        return 'Fair'
-    elif score >= 4.0:
-        return 'Poor'
-    else:
-        return 'Unsuitable'
+# Component order of SoilCompatibilityMatrix.components
+SOIL_COMPONENTS = ('ph_compatibility', 'water_compatibility', 'nutrient_adequacy', 'erosion_risk')
+NUTRIENTS = ('N', 'P', 'K')
 
-def get_soil_improvement_plan(soil_data: Dict, target_crops: List[str]) -> Dict:
+class SoilCompatibilityMatrix:
     """
-    Generate a comprehensive soil improvement plan for target crops
+    Soil-crop compatibility precomputed for every region x crop pair.
+    Scores are read in O(1); the per-pair analysis text is only built when
+    a caller asks for it through analysis().
     """
     
-    improvements = {
-        'immediate_actions': [],
-        'short_term_goals': [],
-        'long_term_strategies': [],
-        'estimated_costs': {},
-        'timeline': {}
-    }
-    
-    # pH management
-    ph_avg = sum(soil_data['ph_range']) / 2
-    if ph_avg < 6.0:
-        improvements['immediate_actions'].append({
-            'action': 'Apply agricultural lime',
-            'quantity': '2-3 tons per hectare',
-            'cost_per_hectare': 8000,
-            'timeline': '2-3 months before planting'
-        })
-    elif ph_avg > 8.0:
-        improvements['immediate_actions'].append({
-            'action': 'Apply elemental sulfur or organic matter',
-            'quantity': '500-800 kg per hectare',
-            'cost_per_hectare': 6000,
-            'timeline': '3-4 months before planting'
-        })
-    
-    # Organic matter enhancement
-    if soil_data['organic_matter'] < 1.0:
-        improvements['short_term_goals'].append({
-            'goal': 'Increase organic matter content',
-            'methods': ['Compost application', 'Green manuring', 'Crop residue incorporation'],
-            'target': f"Increase from {soil_data['organic_matter']}% to 1.5%",
-            'timeline': '1-2 years',
-            'cost_per_hectare': 15000
-        })
-    
-    # Nutrient management
-    nutrient_costs = {'Low': 12000, 'Medium': 8000, 'High': 4000, 'Very Low': 18000}
-    
-    for nutrient, level in [('nitrogen', soil_data['nitrogen']), 
-                           ('phosphorus', soil_data['phosphorus']), 
-                           ('potassium', soil_data['potassium'])]:
-        if level in ['Low', 'Very Low']:
-            improvements['immediate_actions'].append({
-                'action': f'Apply {nutrient} fertilizers',
-                'cost_per_hectare': nutrient_costs[level],
-                'timeline': 'Before each season'
-            })
-    
-    # Drainage improvements
-    if soil_data['drainage'] == 'Poor':
-        improvements['long_term_strategies'].append({
-            'strategy': 'Install drainage systems',
-            'description': 'Subsurface drainage or raised beds',
-            'cost_per_hectare': 50000,
-            'timeline': '1-2 seasons',
-            'benefits': 'Prevent waterlogging, improve root development'
-        })
-    
-    # Erosion control
-    if soil_data['erosion_risk'] in ['High', 'Very High']:
-        improvements['immediate_actions'].append({
-            'action': 'Implement erosion control measures',
-            'methods': ['Contour farming', 'Terracing', 'Cover crops'],
-            'cost_per_hectare': 25000,
-            'timeline': 'Immediate implementation needed'
-        })
-    
-    return improvements
-
-def analyze_regional_soil_trends(region_name: str) -> Dict:
+    def __init__(self, soil_data: Dict, catalog, version: int):
+        self.soil_data = soil_data
+        self.catalog = catalog
+        self.version = version
+        self.regions = list(soil_data)
+        self.region_index = {name: i for i, name in enumerate(self.regions)}
+        
+        self.soils = encode_soil_profiles(soil_data.values())
+        self.crops = encode_crop_requirements(catalog.records)
+        scores = soil_compatibility_kernel(self.soils, self.crops)
+        self.overall_raw = scores['overall']
+        self.components = scores['components']
+        self.nutrient_scores = scores['nutrient_scores']
+        # Displayed scores use Python's rounding, as analyze_soil_crop_compatibility does
+        self.overall = np.array([round(value, 2) for value in self.overall_raw.ravel().tolist()]).reshape(self.overall_raw.shape)
+        self.grades = suitability_grades(self.overall_raw)
+    
+    def region_row(self, region_name: str) -> Optional[int]:
+        """Matrix row of a region, or None if it has no soil data"""
+        return self.region_index.get(region_name)
+    
+    def analysis(self, row: int, crop_index: int) -> 'SoilCompatibility':
+        """Analysis of one region x crop pair, shaped like analyze_soil_crop_compatibility"""
+        return SoilCompatibility(self, row, crop_index)
+
+class SoilCompatibility(Mapping):
     """
-    Analyze soil degradation and improvement trends for a region
+    Read-only view of one matrix cell with the same keys as
+    analyze_soil_crop_compatibility; recommendations are generated lazily
     """
     
-    # Simulate soil trend data
-    years = list(range(2019, 2025))
-    
-    # Generate realistic trend data based on region characteristics
-    soil_data = get_detailed_soil_data().get(region_name, {})
-    
-    trends = {
-        'organic_matter_trend': [],
-        'ph_stability': [],
-        'erosion_progression': [],
-        'salinity_changes': []
-    }
-    
-    base_om = soil_data.get('organic_matter', 0.5)
-    base_ph = sum(soil_data.get('ph_range', [6.5, 7.5])) / 2
-    
-    for i, year in enumerate(years):
-        # Organic matter trend (generally declining without intervention)
-        om_change = -0.02 * i + np.random.normal(0, 0.01)
-        trends['organic_matter_trend'].append({
-            'year': year,
-            'value': max(0.1, base_om + om_change)
-        })
-        
-        # pH stability
-        ph_change = np.random.normal(0, 0.1)
-        trends['ph_stability'].append({
-            'year': year,
-            'value': base_ph + ph_change
-        })
-        
-        # Erosion progression (getting worse without control)
-        erosion_score = max(1, min(10, 7 - i * 0.3 + np.random.normal(0, 0.5)))
-        trends['erosion_progression'].append({
-            'year': year,
-            'value': erosion_score
-        })
+    __slots__ = ('matrix', 'row', 'col', '_recommendations')
+    
+    _KEYS = ('overall_score', 'component_scores', 'detailed_analysis', 'recommendations', 'suitability_grade')
+    
+    def __init__(self, matrix: SoilCompatibilityMatrix, row: int, col: int):
+        self.matrix = matrix
+        self.row = row
+        self.col = col
+        self._recommendations = None
+    
+    def __getitem__(self, key):
+        m, r, c = self.matrix, self.row, self.col
+        if key == 'overall_score':
+            return float(m.overall[r, c])
+        if key == 'component_scores':
+            return {name: round(value, 2) for name, value in zip(SOIL_COMPONENTS, m.components[r, c].tolist())}
+        if key == 'suitability_grade':
+            return m.grades[r, c]
+        if key == 'detailed_analysis':
+            return _detailed_analysis(self._crop, self._soil, self._nutrient_scores())
+        if key == 'recommendations':
+            if self._recommendations is None:
+                ph, water, nutrient, erosion = m.components[r, c].tolist()
+                scores = {'ph': ph, 'water': water, 'nutrient': nutrient, 'erosion': erosion,
+                          'nutrient_scores': self._nutrient_scores()}
+                self._recommendations = _compatibility_recommendations(self._crop, self._soil, scores)
+            return self._recommendations
+        raise KeyError(key)
+    
+    def __iter__(self):
+        return iter(self._KEYS)
+    
+    def __len__(self):
+        return len(self._KEYS)
+    
+    @property
+    def _crop(self):
+        return self.matrix.catalog.records[self.col]
+    
+    @property
+    def _soil(self):
+        return self.matrix.soil_data[self.matrix.regions[self.row]]
+    
+    def _nutrient_scores(self):
+        return dict(zip(NUTRIENTS, self.matrix.nutrient_scores[self.row, self.col].tolist()))
+
+_compatibility_matrix = None
+
+def get_soil_compatibility_matrix() -> SoilCompatibilityMatrix:
+    """
+    Get the region x crop soil compatibility matrix, rebuilding it when the
+    soil data or the crop catalog has changed
+    """
+    global _compatibility_matrix
+    catalog = get_crop_catalog()
+    matrix = _compatibility_matrix
+    if matrix is None or matrix.version != _soil_data_version or matrix.catalog is not catalog:
+        matrix = SoilCompatibilityMatrix(get_detailed_soil_data(), catalog, _soil_data_version)
+        _compatibility_matrix = matrix
+    return matrix
+
+def get_suitability_grade(score: float) -> str:
+    """Convert numerical score to grade"""
+    if not np.isfinite(score):
+        return UNKNOWN_GRADE
+    return SUITABILITY_GRADES[int(np.digitize(score, GRADE_BOUNDS))]
+
+# Soil improvement actions in plan order: (action key, plan section, plan entry)
+IMPROVEMENT_ACTIONS = (
+    ('lime', 'immediate_actions', {
+        'action': 'Apply agricultural lime',
+        'quantity': '2-3 tons per hectare',
+        'cost_per_hectare': 8000,
+        'timeline': '2-3 months before planting'
+    }),
+    ('sulfur', 'immediate_actions', {
+        'action': 'Apply elemental sulfur or organic matter',
+        'quantity': '500-800 kg per hectare',
+        'cost_per_hectare': 6000,
+        'timeline': '3-4 months before planting'
+    }),
+    ('nitrogen', 'immediate_actions', {'action': 'Apply nitrogen fertilizers', 'timeline': 'Before each season'}),
+    ('phosphorus', 'immediate_actions', {'action': 'Apply phosphorus fertilizers', 'timeline': 'Before each season'}),
+    ('potassium', 'immediate_actions', {'action': 'Apply potassium fertilizers', 'timeline': 'Before each season'}),
+    ('erosion_control', 'immediate_actions', {
+        'action': 'Implement erosion control measures',
+        'methods': ['Contour farming', 'Terracing', 'Cover crops'],
+        'cost_per_hectare': 25000,
+        'timeline': 'Immediate implementation needed'
+    }),
+    ('organic_matter', 'short_term_goals', {
+        'goal': 'Increase organic matter content',
+        'methods': ['Compost application', 'Green manuring', 'Crop residue incorporation'],
+        'timeline': '1-2 years',
+        'cost_per_hectare': 15000
+    }),
+    ('drainage', 'long_term_strategies', {
+        'strategy': 'Install drainage systems',
+        'description': 'Subsurface drainage or raised beds',
+        'cost_per_hectare': 50000,
+        'timeline': '1-2 seasons',
+        'benefits': 'Prevent waterlogging, improve root development'
+    })
+)
+IMPROVEMENT_ACTION_KEYS = tuple(key for key, _, _ in IMPROVEMENT_ACTIONS)
+PLAN_SECTIONS = ('immediate_actions', 'short_term_goals', 'long_term_strategies')
+
+# Fertilizer cost per hectare by soil nutrient level (unknown levels cost as Medium)
+NUTRIENT_COSTS = {'Low': 12000, 'Medium': 8000, 'High': 4000, 'Very Low': 18000}
+NUTRIENT_COST_TABLE = np.array([NUTRIENT_COSTS.get(level, 8000) for level in NUTRIENT_CATEGORIES] + [8000], dtype=float)
+
+def _target_crop_needs(target_crops: List[str]):
+    """pH bounds and highest N, P, K needs of the target crops (defaults without targets)"""
+    crops = [crop for crop in get_crop_catalog().lookup_many(target_crops or []) if crop is not None]
+    if not crops:
+        return 6.0, 8.0, None
+    needs = encode_crop_requirements(crops)
+    return (
+        min(crop['soil_ph_min'] for crop in crops),
+        max(crop['soil_ph_max'] for crop in crops),
+        CROP_NEEDS_TABLE[needs['type']].max(axis=0)
+    )
+
+def get_soil_improvement_plans(profiles, target_crops: Optional[List[str]] = None,
+                               hectares=None, districts=None, include_plans: bool = True) -> Dict:
+    """
+    Soil improvement plans for many field profiles at once. Every rule is a
+    vectorized mask over the fields; per-field plans, cost per hectare and
+    cost rollups per action and per district come out of the same pass.
+    With target_crops, pH limits follow the crops' pH range and nutrients
+    are also topped up when below what the crops need. include_plans=False
+    skips building the per-field plan dicts when only the rollups are needed.
+    """
+    profiles = list(profiles)
+    soils = encode_soil_profiles(profiles)
+    organic_matter = np.array([profile.get('organic_matter', np.nan) for profile in profiles], dtype=float)
+    hectares = np.ones(len(profiles)) if hectares is None else np.asarray(hectares, dtype=float)
+    ph_min, ph_max, crop_needs = _target_crop_needs(target_crops)
+    
+    # Nutrients rated Low or Very Low, or short of the target crops' needs
+    nutrient_codes = soils['nutrients']
+    deficient = nutrient_codes <= NUTRIENT_CATEGORIES.index('Low')
+    if crop_needs is not None:
+        deficient |= NUTRIENT_LEVEL_TABLE[nutrient_codes] < crop_needs - 2
+    
+    masks = np.stack([
+        soils['ph'] < ph_min,
+        soils['ph'] > ph_max,
+        deficient[:, 0],
+        deficient[:, 1],
+        deficient[:, 2],
+        soils['erosion_risk'] >= EROSION_CATEGORIES.index('High'),
+        organic_matter < 1.0,
+        soils['drainage'] == DRAINAGE_CATEGORIES.index('Poor')
+    ], axis=1)
+    # Unknown categories get no action
+    masks[:, 2:5] &= nutrient_codes < len(NUTRIENT_CATEGORIES)
+    masks[:, 5] &= soils['erosion_risk'] < len(EROSION_CATEGORIES)
+    
+    unit_costs = np.array([entry.get('cost_per_hectare', 0) for _, _, entry in IMPROVEMENT_ACTIONS], dtype=float)
+    costs = np.broadcast_to(unit_costs, masks.shape).copy()
+    costs[:, 2:5] = NUTRIENT_COST_TABLE[nutrient_codes]
+    costs = np.where(masks, costs, 0.0)
+    cost_per_hectare = costs.sum(axis=1)
+    field_costs = costs * hectares[:, None]
+    
+    # Rollups per action and per district
+    by_action = dict(zip(IMPROVEMENT_ACTION_KEYS, field_costs.sum(axis=0).tolist()))
+    by_district = {}
+    if districts is not None:
+        names, inverse = np.unique(np.asarray(districts, dtype=object).astype(str), return_inverse=True)
+        district_costs = np.zeros((len(names), len(IMPROVEMENT_ACTION_KEYS)))
+        np.add.at(district_costs, inverse, field_costs)
+        district_hectares = np.bincount(inverse, weights=hectares, minlength=len(names))
+        district_fields = np.bincount(inverse, weights=masks.any(axis=1), minlength=len(names))
+        for d, name in enumerate(names.tolist()):
+            by_district[name] = {
+                'total_cost': float(district_costs[d].sum()),
+                'hectares': float(district_hectares[d]),
+                'fields_needing_action': int(district_fields[d]),
+                'by_action': dict(zip(IMPROVEMENT_ACTION_KEYS, district_costs[d].tolist()))
+            }
+    
+    section_of = np.array([PLAN_SECTIONS.index(section) for _, section, _ in IMPROVEMENT_ACTIONS])
+    section_costs = np.stack([costs[:, section_of == k].sum(axis=1) for k in range(len(PLAN_SECTIONS))], axis=1)
+    
+    plans = []
+    for f, actions in enumerate(masks.tolist() if include_plans else []):
+        plan = {section: [] for section in PLAN_SECTIONS}
+        timeline = {}
+        for a, active in enumerate(actions):
+            if not active:
+                continue
+            key, section, template = IMPROVEMENT_ACTIONS[a]
+            entry = dict(template)
+            entry['cost_per_hectare'] = int(costs[f, a])
+            if key == 'organic_matter':
+                entry['target'] = f"Increase from {profiles[f]['organic_matter']}% to 1.5%"
+            plan[section].append(entry)
+            label = entry.get('action') or entry.get('goal') or entry.get('strategy')
+            timeline.setdefault(entry['timeline'], []).append(label)
         
-        # Salinity changes
-        salinity_levels = {'Low': 2, 'Medium': 5, 'High': 8}
-        base_salinity = salinity_levels.get(soil_data.get('salinity_level', 'Low'), 2)
-        salinity_change = np.random.normal(0, 0.2)
-        trends['salinity_changes'].append({
-            'year': year,
-            'value': max(1, min(10, base_salinity + salinity_change))
-        })
+        plan['estimated_costs'] = {
+            **dict(zip(PLAN_SECTIONS, section_costs[f].tolist())),
+            'total_per_hectare': float(cost_per_hectare[f]),
+            'total': float(cost_per_hectare[f] * hectares[f])
+        }
+        plan['timeline'] = timeline
+        plans.append(plan)
     
     return {
-        'region': region_name,
-        'trends': trends,
-        'analysis': {
-            'organic_matter_status': 'Declining' if base_om < 0.5 else 'Stable',
-            'major_concerns': get_soil_concerns(soil_data),
-            'improvement_priority': get_improvement_priorities(soil_data)
-        }
+        'plans': plans,
+        'actions': masks,
+        'costs_per_hectare': costs,
+        'cost_per_hectare': cost_per_hectare,
+        'total_cost': float(field_costs.sum()),
+        'cost_by_action': by_action,
+        'cost_by_district': by_district
     }
 
+def get_soil_improvement_plan(soil_data: Dict, target_crops: List[str]) -> Dict:
+    """
+    Generate a comprehensive soil improvement plan for target crops
+    """
+    return get_soil_improvement_plans([soil_data], target_crops)['plans'][0]
+
+SOIL_TREND_YEARS = tuple(range(2019, 2025))
+SOIL_TREND_SERIES = ('organic_matter_trend', 'ph_stability', 'erosion_progression', 'salinity_changes')
+SALINITY_SCORES = {'Low': 2, 'Medium': 5, 'High': 8}
+
+def generate_soil_trends(region_names: List[str], years=SOIL_TREND_YEARS, seed: int = 0) -> np.ndarray:
+    """
+    (regions, series, years) array of the soil trend series in
+    SOIL_TREND_SERIES order. Each region's noise comes from its own
+    (seed, region) stream, so a region's trends do not depend on which
+    other regions are generated with it.
+    """
+    if not len(region_names):
+        return np.empty((0, len(SOIL_TREND_SERIES), len(years)))
+    
+    profiles = [_region_soil_profile(name) for name in region_names]
+    base_om = np.array([profile.get('organic_matter', 0.5) for profile in profiles], dtype=float)[:, None]
+    base_ph = np.array([sum(profile.get('ph_range', [6.5, 7.5])) / 2 for profile in profiles])[:, None]
+    base_salinity = np.array([
+        SALINITY_SCORES.get(profile.get('salinity_level', 'Low'), 2) for profile in profiles
+    ], dtype=float)[:, None]
+    
+    noise = np.stack([
+        np.random.default_rng([seed, zlib.crc32(name.encode('utf-8'))]).standard_normal((len(SOIL_TREND_SERIES), len(years)))
+        for name in region_names
+    ]).reshape(len(region_names), len(SOIL_TREND_SERIES), len(years))
+    i = np.arange(len(years))
+    
+    # Organic matter trend (generally declining without intervention)
+    organic_matter = np.maximum(0.1, base_om + (-0.02 * i + noise[:, 0] * 0.01))
+    # pH stability
+    ph = base_ph + noise[:, 1] * 0.1
+    # Erosion progression (getting worse without control)
+    erosion = np.clip(7 - i * 0.3 + noise[:, 2] * 0.5, 1, 10)
+    # Salinity changes
+    salinity = np.clip(base_salinity + noise[:, 3] * 0.2, 1, 10)
+    
+    return np.stack([organic_matter, ph, erosion, salinity], axis=1)
+
+@lru_cache(maxsize=1024)
+def _region_soil_trends(region_name: str, years: tuple, seed: int, soil_version: int) -> np.ndarray:
+    """(series, years) trend array of one region, keyed on (region, years, seed, soil data version)"""
+    series = generate_soil_trends([region_name], years, seed)[0]
+    series.flags.writeable = False
+    return series
+
+def get_regional_soil_trends(region_names: List[str], years=SOIL_TREND_YEARS, seed: int = 0) -> Dict[str, Dict]:
+    """
+    Soil trend analyses of several regions, e.g. for comparison views.
+    Results are memoized per (region, years, seed) in a bounded LRU cache
+    until the soil data changes.
+    """
+    years = tuple(years)
+    results = {}
+    for name in region_names:
+        series = _region_soil_trends(name, years, seed, _soil_data_version)
+        soil_data = _region_soil_profile(name)
+        base_om = soil_data.get('organic_matter', 0.5)
+        results[name] = {
+            'region': name,
+            'trends': {
+                key: [{'year': year, 'value': value} for year, value in zip(years, values)]
+                for key, values in zip(SOIL_TREND_SERIES, series.tolist())
+            },
+            'analysis': {
+                'organic_matter_status': 'Declining' if base_om < 0.5 else 'Stable',
+                'major_concerns': get_soil_concerns(soil_data),
+                'improvement_priority': get_improvement_priorities(soil_data)
+            }
+        }
+    return results
+
+def analyze_regional_soil_trends(region_name: str, years=SOIL_TREND_YEARS, seed: int = 0) -> Dict:
+    """
+    Analyze soil degradation and improvement trends for a region
+    """
+    return get_regional_soil_trends([region_name], years, seed)[region_name]
+
 def get_soil_concerns(soil_data: Dict) -> List[str]:
     """Identify major soil concerns for a region"""
     concerns = []
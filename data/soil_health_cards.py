@@ -0,0 +1,161 @@
+import os
+import numpy as np
+import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+from data.crop_database import get_crop_catalog
+from data.soil_analysis import (
+    NUTRIENT_CATEGORIES, DRAINAGE_CATEGORIES, EROSION_CATEGORIES,
+    encode_crop_requirements, soil_compatibility_kernel, suitability_grades, _ordinal
+)
+
+# Soil health card headers mapped to canonical columns (matched case-insensitively)
+SHC_COLUMNS = {
+    'farm_id': 'farm_id', 'card_id': 'farm_id', 'sample_id': 'farm_id',
+    'n': 'nitrogen', 'nitrogen': 'nitrogen', 'available_n': 'nitrogen',
+    'p': 'phosphorus', 'phosphorus': 'phosphorus', 'available_p': 'phosphorus',
+    'k': 'potassium', 'potassium': 'potassium', 'available_k': 'potassium',
+    'ph': 'ph',
+    'oc': 'organic_carbon', 'organic_carbon': 'organic_carbon',
+    'ec': 'ec', 'electrical_conductivity': 'ec',
+    'drainage': 'drainage', 'erosion_risk': 'erosion_risk'
+}
+
+# Upper bounds (kg/ha) of Very Low, Low, Medium and High available nutrients;
+# the Low/Medium/High limits follow the soil health card ratings
+NUTRIENT_BOUNDS = {
+    'nitrogen': (140, 280, 560, 700),
+    'phosphorus': (5, 10, 25, 40),
+    'potassium': (60, 110, 280, 400)
+}
+
+# Electrical conductivity (dS/m) bounds of Low, Medium and High salinity
+EC_BOUNDS = (1.0, 3.0)
+SALINITY_CATEGORIES = ('Low', 'Medium', 'High')
+
+# Organic matter is organic carbon times the Van Bemmelen factor
+ORGANIC_MATTER_FACTOR = 1.724
+
+def read_health_card_chunks(csv_path: str, chunksize: int = 50_000, column_map: Optional[Dict] = None):
+    """Soil health card records in DataFrame chunks with canonical column names"""
+    column_map = {key.lower(): value for key, value in {**SHC_COLUMNS, **(column_map or {})}.items()}
+    start = 0
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+        chunk = chunk.rename(columns=lambda name: column_map.get(name.strip().lower(), name))
+        if 'farm_id' not in chunk:
+            chunk['farm_id'] = np.arange(start, start + len(chunk))
+        start += len(chunk)
+        yield chunk
+
+def encode_health_cards(cards: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Soil health card measurements as the ordinal arrays of encode_soil_profiles.
+    Drainage and erosion risk are not on the card; unless given as columns
+    they get the unknown code and so the default score, as do missing readings.
+    """
+    def measured(column):
+        return pd.to_numeric(cards[column], errors='coerce').to_numpy(float)
+
+    def categorical(column, categories):
+        if column in cards:
+            return _ordinal(cards[column].tolist(), categories)
+        return np.full(len(cards), len(categories), dtype=np.uint8)
+
+    nutrients = np.stack([
+        np.where(np.isnan(values), len(NUTRIENT_CATEGORIES), np.digitize(values, bounds))
+        for values, bounds in ((measured(key), NUTRIENT_BOUNDS[key]) for key in ('nitrogen', 'phosphorus', 'potassium'))
+    ], axis=-1).astype(np.uint8)
+
+    ph = measured('ph')
+    encoded = {
+        'ph': np.where(np.isnan(ph), 7.0, ph),  # Neutral when not measured
+        'nutrients': nutrients,
+        'drainage': categorical('drainage', DRAINAGE_CATEGORIES),
+        'erosion_risk': categorical('erosion_risk', EROSION_CATEGORIES)
+    }
+    if 'organic_carbon' in cards:
+        encoded['organic_matter'] = measured('organic_carbon') * ORGANIC_MATTER_FACTOR
+    if 'ec' in cards:
+        ec = measured('ec')
+        encoded['salinity'] = np.where(
+            np.isfinite(ec), np.digitize(ec, EC_BOUNDS), len(SALINITY_CATEGORIES)
+        ).astype(np.uint8)
+    return encoded
+
+def health_card_profiles(cards: pd.DataFrame) -> List[Dict]:
+    """Soil health cards as soil profile dicts accepted by analyze_soil_crop_compatibility"""
+    encoded = encode_health_cards(cards)
+    levels = np.array(NUTRIENT_CATEGORIES + (None,), dtype=object)[encoded['nutrients']]
+    profiles = []
+    for i, ph in enumerate(encoded['ph'].tolist()):
+        profile = {
+            'ph_range': [ph, ph],
+            'nitrogen': levels[i, 0],
+            'phosphorus': levels[i, 1],
+            'potassium': levels[i, 2],
+            'drainage': cards['drainage'].iloc[i] if 'drainage' in cards else None,
+            'erosion_risk': cards['erosion_risk'].iloc[i] if 'erosion_risk' in cards else None
+        }
+        # Parameters not measured on a card are left out, so profile defaults apply
+        if 'organic_matter' in encoded and np.isfinite(encoded['organic_matter'][i]):
+            profile['organic_matter'] = float(encoded['organic_matter'][i])
+        if 'salinity' in encoded and encoded['salinity'][i] < len(SALINITY_CATEGORIES):
+            profile['salinity_level'] = SALINITY_CATEGORIES[encoded['salinity'][i]]
+        profiles.append(profile)
+    return profiles
+
+def score_health_cards(cards: pd.DataFrame, crops: Dict[str, np.ndarray], crop_names: np.ndarray, top_n: int = 3) -> pd.DataFrame:
+    """Best top_n crops of every farm with their soil scores and grades"""
+    overall = soil_compatibility_kernel(encode_health_cards(cards), crops)['overall']
+    top_n = min(top_n, overall.shape[1])
+
+    # Highest scores first, ties in catalog order
+    order = np.argsort(-overall, axis=1, kind='stable')[:, :top_n]
+    best = np.take_along_axis(overall, order, axis=1)
+    grades = suitability_grades(best)
+
+    results = {'farm_id': cards['farm_id'].to_numpy()}
+    for rank in range(top_n):
+        results[f'crop_{rank + 1}'] = crop_names[order[:, rank]]
+        results[f'score_{rank + 1}'] = np.round(best[:, rank], 2)
+        results[f'grade_{rank + 1}'] = grades[:, rank]
+    return pd.DataFrame(results)
+
+def score_health_card_file(csv_path: str, output_path: str, catalog=None, chunksize: int = 50_000,
+                           top_n: int = 3, column_map: Optional[Dict] = None,
+                           processes: Optional[int] = None) -> Dict:
+    """
+    Stream a soil health card CSV, score every farm against the crop catalog
+    and append the results to output_path chunk by chunk. With processes,
+    chunks are scored in a process pool with at most two chunks per worker
+    in flight, so memory stays bounded by the chunk size.
+    """
+    catalog = catalog or get_crop_catalog()
+    crops = encode_crop_requirements(catalog.records)
+    crop_names = np.asarray(catalog.columns['name'], dtype=object)
+    chunks = read_health_card_chunks(csv_path, chunksize, column_map)
+
+    if os.path.exists(output_path):
+        os.remove(output_path)
+    summary = {'farms': 0, 'chunks': 0}
+
+    def write(results):
+        results.to_csv(output_path, mode='a', header=summary['chunks'] == 0, index=False)
+        summary['farms'] += len(results)
+        summary['chunks'] += 1
+
+    if not processes or processes < 2:
+        for cards in chunks:
+            write(score_health_cards(cards, crops, crop_names, top_n))
+        return summary
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        pending = deque()
+        for cards in chunks:
+            pending.append(pool.submit(score_health_cards, cards, crops, crop_names, top_n))
+            if len(pending) >= 2 * processes:
+                write(pending.popleft().result())
+        while pending:
+            write(pending.popleft().result())
+    return summary
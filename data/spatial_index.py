@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+from data.regions_data import get_indian_states_data, get_district_coordinates
+from data.records import LocationRecord
+
+EARTH_RADIUS_KM = 6371.0088
+
+def _unit_vectors(lat, lon):
+    """Points on the unit sphere for latitudes and longitudes in degrees"""
+    lat, lon = np.radians(lat), np.radians(lon)
+    cos_lat = np.cos(lat)
+    return np.stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)], axis=-1)
+
+def chord_to_km(chord):
+    """Great-circle (haversine) distance in km of a unit-sphere chord length"""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0, 1))
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km between coordinate pairs"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+class LocationIndex:
+    """
+    KD-tree over locations (blocks, districts and state centres) placed on
+    the unit sphere, so Euclidean nearest neighbours are great-circle
+    nearest neighbours; distances are reported in km.
+    """
+
+    def __init__(self, locations):
+        self.locations = list(locations)
+        self.lat = np.array([location['lat'] for location in self.locations], dtype=float)
+        self.lon = np.array([location['lon'] for location in self.locations], dtype=float)
+        self.tree = cKDTree(_unit_vectors(self.lat, self.lon))
+
+    def __len__(self):
+        return len(self.locations)
+
+    def query_bulk(self, lats, lons, k=1):
+        """
+        Indices and distances (km) of the k nearest locations of every point,
+        as (points, k) arrays; k is capped at the number of locations
+        """
+        k = min(k, len(self.locations))
+        points = _unit_vectors(np.asarray(lats, dtype=float), np.asarray(lons, dtype=float))
+        chords, indices = self.tree.query(points.reshape(-1, 3), k=k)
+        return indices.reshape(-1, k), chord_to_km(chords).reshape(-1, k)
+
+    def nearest(self, lat, lon, k=1):
+        """The k nearest locations of a point, closest first, each with its distance_km"""
+        indices, distances = self.query_bulk([lat], [lon], k)
+        return [
+            {**self.locations[i], 'distance_km': float(distance)}
+            for i, distance in zip(indices[0].tolist(), distances[0].tolist())
+        ]
+
+    def resolve(self, lat, lon):
+        """The nearest location of a point"""
+        return self.nearest(lat, lon)[0]
+
+    def resolve_bulk(self, lats, lons):
+        """Nearest location record of every point, e.g. a list of farm coordinates"""
+        indices, distances = self.query_bulk(lats, lons)
+        return [
+            {**self.locations[i], 'distance_km': float(distance)}
+            for i, distance in zip(indices[:, 0].tolist(), distances[:, 0].tolist())
+        ]
+
+def default_locations():
+    """State centres and the known districts of every state"""
+    locations = []
+    for state in get_indian_states_data():
+        locations.extend(get_district_coordinates(state['name']))
+        locations.append(LocationRecord(
+            name=state['name'], kind='state', state=state['name'],
+            lat=state['lat'], lon=state['lon']
+        ))
+    return locations
+
+def load_block_locations(csv_path):
+    """Block records (name, state, district, lat, lon) from a CSV of block centroids"""
+    blocks = pd.read_csv(csv_path)
+    blocks.columns = [column.strip().lower() for column in blocks.columns]
+    blocks['kind'] = 'block'
+    return [LocationRecord(block) for block in blocks.to_dict('records')]
+
+_location_index = None
+
+def set_location_index(locations):
+    """Replace the shared index, e.g. with default_locations() plus loaded blocks"""
+    global _location_index
+    _location_index = LocationIndex(locations)
+    return _location_index
+
+def get_location_index():
+    global _location_index
+    if _location_index is None:
+        _location_index = LocationIndex(default_locations())
+    return _location_index
+
+def resolve_location(lat, lon):
+    """Nearest known block, district or state centre of a coordinate"""
+    return get_location_index().resolve(lat, lon)
@@ -1,179 +1,261 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import random
+import zlib
+from datetime import datetime
+from functools import lru_cache
+from collections.abc import Mapping
 
-def get_weather_data_for_region(region_name):
+# Regional climate patterns for major Indian states/regions
+REGIONAL_PATTERNS = {
+    'Punjab': {
+        'base_temp': 24, 'temp_variation': 15,
+        'base_rainfall': 600, 'rainfall_variation': 200,
+        'base_humidity': 65, 'humidity_variation': 15,
+        'monsoon_months': [6, 7, 8, 9],
+        'winter_months': [12, 1, 2],
+        'summer_months': [4, 5, 6]
+    },
+    'Maharashtra': {
+        'base_temp': 26, 'temp_variation': 12,
+        'base_rainfall': 1200, 'rainfall_variation': 400,
+        'base_humidity': 70, 'humidity_variation': 20,
+        'monsoon_months': [6, 7, 8, 9],
+        'winter_months': [12, 1, 2],
+        'summer_months': [3, 4, 5]
+    },
+    'Tamil Nadu': {
+        'base_temp': 28, 'temp_variation': 8,
+        'base_rainfall': 1000, 'rainfall_variation': 300,
+        'base_humidity': 75, 'humidity_variation': 15,
+        'monsoon_months': [10, 11, 12],
+        'winter_months': [1, 2],
+        'summer_months': [3, 4, 5, 6]
+    },
+    'Uttar Pradesh': {
+        'base_temp': 25, 'temp_variation': 18,
+        'base_rainfall': 800, 'rainfall_variation': 250,
+        'base_humidity': 65, 'humidity_variation': 20,
+        'monsoon_months': [6, 7, 8, 9],
+        'winter_months': [12, 1, 2],
+        'summer_months': [4, 5, 6]
+    },
+    'Karnataka': {
+        'base_temp': 25, 'temp_variation': 10,
+        'base_rainfall': 1100, 'rainfall_variation': 350,
+        'base_humidity': 68, 'humidity_variation': 18,
+        'monsoon_months': [6, 7, 8, 9],
+        'winter_months': [12, 1, 2],
+        'summer_months': [3, 4, 5]
+    },
+    'Gujarat': {
+        'base_temp': 27, 'temp_variation': 14,
+        'base_rainfall': 700, 'rainfall_variation': 200,
+        'base_humidity': 60, 'humidity_variation': 20,
+        'monsoon_months': [6, 7, 8, 9],
+        'winter_months': [12, 1, 2],
+        'summer_months': [4, 5, 6]
+    },
+    'Rajasthan': {
+        'base_temp': 27, 'temp_variation': 20,
+        'base_rainfall': 400, 'rainfall_variation': 150,
+        'base_humidity': 45, 'humidity_variation': 25,
+        'monsoon_months': [7, 8, 9],
+        'winter_months': [12, 1, 2],
+        'summer_months': [4, 5, 6]
+    },
+    'West Bengal': {
+        'base_temp': 26, 'temp_variation': 12,
+        'base_rainfall': 1500, 'rainfall_variation': 400,
+        'base_humidity': 80, 'humidity_variation': 15,
+        'monsoon_months': [6, 7, 8, 9],
+        'winter_months': [12, 1, 2],
+        'summer_months': [3, 4, 5]
+    },
+    'Andhra Pradesh': {
+        'base_temp': 28, 'temp_variation': 10,
+        'base_rainfall': 900, 'rainfall_variation': 300,
+        'base_humidity': 70, 'humidity_variation': 18,
+        'monsoon_months': [6, 7, 8, 9, 10],
+        'winter_months': [12, 1, 2],
+        'summer_months': [3, 4, 5]
+    },
+    'Madhya Pradesh': {
+        'base_temp': 25, 'temp_variation': 16,
+        'base_rainfall': 1000, 'rainfall_variation': 300,
+        'base_humidity': 65, 'humidity_variation': 20,
+        'monsoon_months': [6, 7, 8, 9],
+        'winter_months': [12, 1, 2],
+        'summer_months': [4, 5, 6]
+    }
+}
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+          'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+# Independent noise streams drawn per month
+NOISE_MIN_TEMP, NOISE_MAX_TEMP, NOISE_RAINFALL, NOISE_RAINY_DAYS, NOISE_HUMIDITY = range(5)
+NOISE_STREAMS = 5
+# Noise stream drawn once per year (month key 0): the year's temperature anomaly
+NOISE_YEAR_TEMP = NOISE_STREAMS
+# Largest departure (degC) of a year's temperatures from the regional pattern
+YEAR_TEMP_ANOMALY = 0.75
+
+def _splitmix64(x):
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+def _hash_uniform(*keys):
     """
-    Generate realistic weather data for Indian regions based on actual climate patterns
+    Deterministic uniform [0, 1) noise from integer keys, broadcast over arrays.
+    Counter-based (SplitMix64), so every key gives the same number no matter
+    which other keys are generated alongside it.
     """
-    
-    # Regional climate patterns for major Indian states/regions
-    regional_patterns = {
-        'Punjab': {
-            'base_temp': 24, 'temp_variation': 15,
-            'base_rainfall': 600, 'rainfall_variation': 200,
-            'base_humidity': 65, 'humidity_variation': 15,
-            'monsoon_months': [6, 7, 8, 9],
-            'winter_months': [12, 1, 2],
-            'summer_months': [4, 5, 6]
-        },
-        'Maharashtra': {
-            'base_temp': 26, 'temp_variation': 12,
-            'base_rainfall': 1200, 'rainfall_variation': 400,
-            'base_humidity': 70, 'humidity_variation': 20,
-            'monsoon_months': [6, 7, 8, 9],
-            'winter_months': [12, 1, 2],
-            'summer_months': [3, 4, 5]
-        },
-        'Tamil Nadu': {
-            'base_temp': 28, 'temp_variation': 8,
-            'base_rainfall': 1000, 'rainfall_variation': 300,
-            'base_humidity': 75, 'humidity_variation': 15,
-            'monsoon_months': [10, 11, 12],
-            'winter_months': [1, 2],
-            'summer_months': [3, 4, 5, 6]
-        },
-        'Uttar Pradesh': {
-            'base_temp': 25, 'temp_variation': 18,
-            'base_rainfall': 800, 'rainfall_variation': 250,
-            'base_humidity': 65, 'humidity_variation': 20,
-            'monsoon_months': [6, 7, 8, 9],
-            'winter_months': [12, 1, 2],
-            'summer_months': [4, 5, 6]
-        },
-        'Karnataka': {
-            'base_temp': 25, 'temp_variation': 10,
-            'base_rainfall': 1100, 'rainfall_variation': 350,
-            'base_humidity': 68, 'humidity_variation': 18,
-            'monsoon_months': [6, 7, 8, 9],
-            'winter_months': [12, 1, 2],
-            'summer_months': [3, 4, 5]
-        },
-        'Gujarat': {
-            'base_temp': 27, 'temp_variation': 14,
-            'base_rainfall': 700, 'rainfall_variation': 200,
-            'base_humidity': 60, 'humidity_variation': 20,
-            'monsoon_months': [6, 7, 8, 9],
-            'winter_months': [12, 1, 2],
-            'summer_months': [4, 5, 6]
-        },
-        'Rajasthan': {
-            'base_temp': 27, 'temp_variation': 20,
-            'base_rainfall': 400, 'rainfall_variation': 150,
-            'base_humidity': 45, 'humidity_variation': 25,
-            'monsoon_months': [7, 8, 9],
-            'winter_months': [12, 1, 2],
-            'summer_months': [4, 5, 6]
-        },
-        'West Bengal': {
-            'base_temp': 26, 'temp_variation': 12,
-            'base_rainfall': 1500, 'rainfall_variation': 400,
-            'base_humidity': 80, 'humidity_variation': 15,
-            'monsoon_months': [6, 7, 8, 9],
-            'winter_months': [12, 1, 2],
-            'summer_months': [3, 4, 5]
-        },
-        'Andhra Pradesh': {
-            'base_temp': 28, 'temp_variation': 10,
-            'base_rainfall': 900, 'rainfall_variation': 300,
-            'base_humidity': 70, 'humidity_variation': 18,
-            'monsoon_months': [6, 7, 8, 9, 10],
-            'winter_months': [12, 1, 2],
-            'summer_months': [3, 4, 5]
-        },
-        'Madhya Pradesh': {
-            'base_temp': 25, 'temp_variation': 16,
-            'base_rainfall': 1000, 'rainfall_variation': 300,
-            'base_humidity': 65, 'humidity_variation': 20,
-            'monsoon_months': [6, 7, 8, 9],
-            'winter_months': [12, 1, 2],
-            'summer_months': [4, 5, 6]
-        }
-    }
+    keys = [np.asarray(key).astype(np.uint64) for key in keys]
+    state = np.zeros(np.broadcast_shapes(*(key.shape for key in keys)), dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for key in keys:
+            state = _splitmix64(state ^ key)
+    return (state >> np.uint64(11)) * (1.0 / (1 << 53))
+
+def _region_key(region_name):
+    """Stable integer key of a region name for the noise generator"""
+    return zlib.crc32(region_name.encode('utf-8'))
+
+# Pattern table: one row per region in REGIONAL_PATTERNS
+PATTERN_VALUES = ('base_temp', 'temp_variation', 'base_rainfall', 'rainfall_variation', 'base_humidity', 'humidity_variation')
+PATTERN_SEASONS = ('monsoon_months', 'winter_months', 'summer_months')
+_PATTERN_INDEX = {name: i for i, name in enumerate(REGIONAL_PATTERNS)}
+_PATTERN_TABLE = np.array([[pattern[key] for key in PATTERN_VALUES] for pattern in REGIONAL_PATTERNS.values()], dtype=float)
+_PATTERN_MONTHS = np.array([
+    [np.isin(np.arange(1, 13), pattern[key]) for key in PATTERN_SEASONS]
+    for pattern in REGIONAL_PATTERNS.values()
+])
+
+# Variables along the last axis of a weather cube
+WEATHER_VARIABLES = ('min_temp', 'avg_temp', 'max_temp', 'rainfall', 'humidity', 'rainy_days')
+
+def generate_weather_cube(regions, years, seed=0):
+    """
+    Generate weather for many regions and years in one vectorized call.
+    Returns a WeatherCube whose values have shape
+    (regions, years, 12 months, len(WEATHER_VARIABLES)); each (region, year)
+    slice equals what get_weather_data_for_region produces for that key.
+    """
+    regions = list(regions)
+    years = np.asarray(list(years), dtype=int)
     
     # Use default pattern if region not found
-    pattern = regional_patterns.get(region_name, regional_patterns['Maharashtra'])
+    rows = [_PATTERN_INDEX.get(name, _PATTERN_INDEX['Maharashtra']) for name in regions]
+    base_temp, temp_variation, base_rainfall, rainfall_variation, base_humidity, _ = (
+        _PATTERN_TABLE[rows, k][:, None, None] for k in range(len(PATTERN_VALUES))
+    )
+    monsoon, winter, summer = (_PATTERN_MONTHS[rows, k][:, None, :] for k in range(len(PATTERN_SEASONS)))
     
-    # Generate monthly data
-    monthly_temp = []
-    monthly_rainfall = []
-    monthly_humidity = []
+    month = np.arange(1, 13)
+    region_keys = np.array([_region_key(name) for name in regions], dtype=np.uint64)
+    noise = _hash_uniform(
+        region_keys[:, None, None, None], years[None, :, None, None], seed,
+        month[None, None, :, None], np.arange(NOISE_STREAMS)
+    )
+    year_noise = _hash_uniform(region_keys[:, None, None], years[None, :, None], seed, 0, NOISE_YEAR_TEMP)
+    transition = np.isin(month, [3, 4, 5, 10, 11])  # Pre/post monsoon
     
-    months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
-              'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+    # Temperature calculation, shifted by the year's anomaly
+    temp_factor = np.select([winter, summer, monsoon], [-0.6, 0.8, 0.1], 0.2)
+    year_anomaly = (2 * year_noise - 1) * YEAR_TEMP_ANOMALY
+    avg_temp = np.broadcast_to(base_temp + (temp_variation * temp_factor) + year_anomaly, noise.shape[:3])
+    min_temp = avg_temp - 5 - noise[..., NOISE_MIN_TEMP] * 3
+    max_temp = avg_temp + 5 + noise[..., NOISE_MAX_TEMP] * 3
     
-    total_rainfall = 0
-    rainy_days = 0
+    # Rainfall calculation
+    rainfall = np.select(
+        [monsoon, transition],
+        [base_rainfall * 0.3 + noise[..., NOISE_RAINFALL] * rainfall_variation * 0.5,
+         base_rainfall * 0.1 + noise[..., NOISE_RAINFALL] * rainfall_variation * 0.2],
+        noise[..., NOISE_RAINFALL] * rainfall_variation * 0.1  # Dry months
+    )
+    low_days = np.select([monsoon, transition], [15, 2], 0)
+    high_days = np.select([monsoon, transition], [25, 8], 3)
+    rainy_days = low_days + np.floor(noise[..., NOISE_RAINY_DAYS] * (high_days - low_days + 1))
     
-    for month_idx in range(12):
-        month = month_idx + 1
-        
-        # Temperature calculation
-        if month in pattern['winter_months']:
-            temp_factor = -0.6
-        elif month in pattern['summer_months']:
-            temp_factor = 0.8
-        elif month in pattern['monsoon_months']:
-            temp_factor = 0.1
-        else:
-            temp_factor = 0.2
-        
-        avg_temp = pattern['base_temp'] + (pattern['temp_variation'] * temp_factor)
-        min_temp = avg_temp - 5 - random.uniform(0, 3)
-        max_temp = avg_temp + 5 + random.uniform(0, 3)
-        
-        monthly_temp.append({
-            'month': months[month_idx],
-            'min_temp': round(min_temp, 1),
-            'max_temp': round(max_temp, 1),
-            'avg_temp': round(avg_temp, 1)
-        })
-        
-        # Rainfall calculation
-        if month in pattern['monsoon_months']:
-            rainfall = pattern['base_rainfall'] * 0.3 + random.uniform(0, pattern['rainfall_variation'] * 0.5)
-            days_rain = random.randint(15, 25)
-        elif month in [3, 4, 5, 10, 11]:  # Pre/post monsoon
-            rainfall = pattern['base_rainfall'] * 0.1 + random.uniform(0, pattern['rainfall_variation'] * 0.2)
-            days_rain = random.randint(2, 8)
-        else:  # Dry months
-            rainfall = random.uniform(0, pattern['rainfall_variation'] * 0.1)
-            days_rain = random.randint(0, 3)
-        
-        monthly_rainfall.append({
-            'month': months[month_idx],
-            'rainfall': round(rainfall, 1)
-        })
-        
-        total_rainfall += rainfall
-        rainy_days += days_rain
-        
-        # Humidity calculation
-        if month in pattern['monsoon_months']:
-            humidity = pattern['base_humidity'] + random.uniform(5, 15)
-        elif month in pattern['winter_months']:
-            humidity = pattern['base_humidity'] - random.uniform(5, 15)
-        else:
-            humidity = pattern['base_humidity'] + random.uniform(-5, 5)
-        
-        humidity = max(20, min(95, humidity))  # Realistic bounds
-        
-        monthly_humidity.append({
-            'month': months[month_idx],
-            'humidity': round(humidity, 1)
-        })
+    # Humidity calculation
+    humidity_offset = np.select(
+        [monsoon, winter],
+        [5 + noise[..., NOISE_HUMIDITY] * 10, -(5 + noise[..., NOISE_HUMIDITY] * 10)],
+        -5 + noise[..., NOISE_HUMIDITY] * 10
+    )
+    humidity = np.clip(base_humidity + humidity_offset, 20, 95)  # Realistic bounds
+    
+    values = np.stack([min_temp, avg_temp, max_temp, rainfall, humidity, rainy_days], axis=-1)
+    return WeatherCube(regions, years.tolist(), values)
+
+class WeatherCube:
+    """Weather of several regions and years as one (regions, years, months, variables) array"""
+    
+    def __init__(self, regions, years, values):
+        self.regions = regions
+        self.years = years
+        self.values = values
+        self.values.flags.writeable = False
+        self.region_index = {name: i for i, name in enumerate(regions)}
+        self.year_index = {year: i for i, year in enumerate(years)}
+    
+    def __array__(self, dtype=None, copy=None):
+        return self.values if dtype is None else self.values.astype(dtype)
+    
+    def variable(self, name):
+        """(regions, years, months) array of one weather variable"""
+        return self.values[..., WEATHER_VARIABLES.index(name)]
+    
+    def monthly(self, region_name, year):
+        """(months, variables) array of one region and year"""
+        return self.values[self.region_index[region_name], self.year_index[year]]
+    
+    def region_weather(self, region_name, year):
+        """Weather dict of one region and year, as returned by get_weather_data_for_region"""
+        return _weather_dict(region_name, self.monthly(region_name, year))
+
+@lru_cache(maxsize=512)
+def _generate_region_weather(region_name, year, seed):
+    """Monthly (months, variables) weather array of a region for one year, keyed on (region, year, seed)"""
+    return generate_weather_cube([region_name], [year], seed).values[0, 0]
+
+def _weather_dict(region_name, monthly, state=None):
+    """
+    Weather dict of a region from its (months, variables) array; state names
+    the regional pattern used for growing seasons and defaults to the region
+    """
+    min_temp, avg_temp, max_temp, rainfall, humidity, rainy_days = np.round(monthly, 1).T.tolist()
+    
+    # Use default pattern if region not found
+    pattern = REGIONAL_PATTERNS.get(state or region_name, REGIONAL_PATTERNS['Maharashtra'])
+    
+    monthly_temp = [
+        {'month': month, 'min_temp': low, 'max_temp': high, 'avg_temp': avg}
+        for month, low, high, avg in zip(MONTHS, min_temp, max_temp, avg_temp)
+    ]
+    monthly_rainfall = [
+        {'month': month, 'rainfall': value}
+        for month, value in zip(MONTHS, rainfall)
+    ]
+    monthly_humidity = [
+        {'month': month, 'humidity': value}
+        for month, value in zip(MONTHS, humidity)
+    ]
     
     # Calculate averages
     avg_temp = sum(month['avg_temp'] for month in monthly_temp) / 12
     avg_humidity = sum(month['humidity'] for month in monthly_humidity) / 12
+    total_rainfall = float(monthly[:, WEATHER_VARIABLES.index('rainfall')].sum())
     
     return {
         'region': region_name,
         'avg_temp': avg_temp,
         'annual_rainfall': total_rainfall,
         'avg_humidity': avg_humidity,
-        'rainy_days': rainy_days,
+        'rainy_days': int(sum(rainy_days)),
         'monthly_temp': monthly_temp,
         'monthly_rainfall': monthly_rainfall,
         'monthly_humidity': monthly_humidity,
@@ -181,6 +263,40 @@ def get_weather_data_for_region(region_name):
         'growing_seasons': get_growing_seasons(pattern)
     }
 
+# Observed weather store consulted before synthesizing (see data.weather_store)
+_weather_store = None
+
+def set_weather_store(store):
+    """Serve observed weather from store for the blocks and years it covers; None disables it"""
+    global _weather_store
+    _weather_store = store
+
+def get_weather_store():
+    return _weather_store
+
+def get_weather_data_for_region(region_name, year=None, seed=0):
+    """
+    Generate realistic weather data for Indian regions based on actual climate patterns.
+    The data is deterministic for a given (region, year, seed); year defaults
+    to the current year. Regions and years covered by the configured weather
+    store are served from its observations instead; for store blocks year
+    defaults to the latest fully observed year, and uncovered years are
+    synthesized from the block's state pattern.
+    """
+    store = _weather_store
+    in_store = store is not None and region_name in store.block_index
+    if year is None:
+        year = store.latest_covered_year(region_name) if in_store else None
+        if year is None:
+            year = datetime.now().year
+    
+    if in_store and store.covers(region_name, year):
+        return store.region_weather(region_name, year)
+    
+    pattern = store.states[store.block_index[region_name]] if in_store else None
+    pattern = pattern or region_name
+    return _weather_dict(region_name, _generate_region_weather(pattern, year, seed), pattern)
+
 def get_climate_zone(avg_temp, annual_rainfall):
     """Classify climate zone based on temperature and rainfall"""
     if annual_rainfall > 1500:
@@ -215,71 +331,104 @@ def get_growing_seasons(pattern):
     
     return seasons
 
-def get_detailed_weather_analysis(region_name):
-    """Get detailed 30-year weather analysis for advanced features"""
+# Seasons summarized in the detailed weather analysis
+ANALYSIS_SEASONS = {
+    'Winter': [12, 1, 2],
+    'Summer': [3, 4, 5],
+    'Monsoon': [6, 7, 8, 9],
+    'Post-Monsoon': [10, 11]
+}
+
+ANALYSIS_COMPONENTS = ('historical_trends', 'seasonal_data', 'drought_risk', 'flood_risk', 'risk_score', 'growing_season_days')
+RISK_COMPONENTS = ('drought_risk', 'flood_risk', 'risk_score')
+
+class WeatherAnalysis(Mapping):
+    """
+    Detailed weather analysis of a region, read from the climate normals cube.
+    Each component is computed on first access and then kept.
+    """
     
-    # Generate 30-year historical trends
-    historical_trends = []
-    base_year = 1994
+    def __init__(self, region_name, normals):
+        self.region_name = region_name
+        self.normals = normals
+        self._values = {}
     
-    for year in range(30):
-        # Add climate change trends - gradual warming and rainfall changes
-        temp_trend = year * 0.03  # 0.03°C increase per year
-        rainfall_trend = year * (-2 if region_name in ['Rajasthan', 'Gujarat'] else 1)  # Different trends for arid regions
-        
-        historical_trends.append({
-            'year': base_year + year,
-            'temperature': 25 + temp_trend + random.uniform(-2, 2),
-            'rainfall': 800 + rainfall_trend + random.uniform(-200, 200)
-        })
+    def __getitem__(self, key):
+        if key not in self._values:
+            if key == 'historical_trends':
+                history = self.history()
+                self._values[key] = [
+                    {'year': year, 'temperature': temperature, 'rainfall': rainfall}
+                    for year, temperature, rainfall in zip(
+                        history['year'].tolist(), history['temperature'].tolist(), history['rainfall'].tolist()
+                    )
+                ]
+            elif key == 'seasonal_data':
+                self._values[key] = self.normals.seasonal_normals(self.region_name, ANALYSIS_SEASONS)
+            elif key in RISK_COMPONENTS:
+                self._values.update(self._risk_metrics())
+            elif key == 'growing_season_days':
+                self._values[key] = 240  # Days suitable for agriculture
+            else:
+                raise KeyError(key)
+        return self._values[key]
     
-    # Seasonal data
-    seasonal_data = [
-        {'season': 'Winter', 'avg_temp': 18, 'rainfall': 50},
-        {'season': 'Summer', 'avg_temp': 35, 'rainfall': 100},
-        {'season': 'Monsoon', 'avg_temp': 28, 'rainfall': 600},
-        {'season': 'Post-Monsoon', 'avg_temp': 25, 'rainfall': 150}
-    ]
+    def __iter__(self):
+        return iter(ANALYSIS_COMPONENTS)
     
-    # Risk assessments
-    drought_risk = max(0, min(100, 50 - (800 / 20)))  # Based on rainfall
-    flood_risk = max(0, min(100, (1200 - 800) / 10))  # Based on excess rainfall
+    def __len__(self):
+        return len(ANALYSIS_COMPONENTS)
     
-    # Climate risk score (1-10, lower is better)
-    risk_score = (drought_risk + flood_risk) / 20
+    def _risk_metrics(self):
+        monthly = self.normals.monthly_normals(self.region_name)
+        normal_rainfall = float(monthly[:, WEATHER_VARIABLES.index('rainfall')].sum())
+        drought_risk = max(0, min(100, 50 - (normal_rainfall / 20)))  # Based on rainfall
+        flood_risk = max(0, min(100, (normal_rainfall - 800) / 10))  # Based on excess rainfall
+        
+        # Climate risk score (1-10, lower is better)
+        risk_score = (drought_risk + flood_risk) / 20
+        
+        return {'drought_risk': drought_risk, 'flood_risk': flood_risk, 'risk_score': risk_score}
     
-    return {
-        'historical_trends': historical_trends,
-        'seasonal_data': seasonal_data,
-        'drought_risk': drought_risk,
-        'flood_risk': flood_risk,
-        'risk_score': risk_score,
-        'growing_season_days': 240  # Days suitable for agriculture
-    }
+    def history(self, last=None):
+        """Yearly temperature and rainfall arrays, limited to the last `last` years"""
+        key = ('history', last)
+        if key not in self._values:
+            years, series = self.normals.annual_cube([self.region_name], last=last)
+            self._values[key] = {
+                'year': np.array(years),
+                'temperature': series['avg_temp'][0],
+                'rainfall': series['rainfall'][0]
+            }
+        return self._values[key]
+    
+    def iter_history(self, chunk_years=10):
+        """Yearly history in chunks of chunk_years, most recent chunk first"""
+        history = self.history()
+        for end in range(len(history['year']), 0, -chunk_years):
+            start = max(0, end - chunk_years)
+            yield {column: values[start:end] for column, values in history.items()}
+
+_weather_analyses = {}
+
+def get_detailed_weather_analysis(region_name):
+    """
+    Get detailed 30-year weather analysis for advanced features. The lazy
+    analysis is memoized per region until the climate normals change.
+    """
+    from data.climate_normals import get_climate_normals  # Built on top of this module
+    
+    normals = get_climate_normals([region_name])
+    cached = _weather_analyses.get(region_name)
+    if cached is None or cached[0] != normals.version:
+        cached = (normals.version, WeatherAnalysis(region_name, normals))
+        _weather_analyses[region_name] = cached
+    return cached[1]
 
 def get_weather_forecast(region_name, days=7):
     """Generate weather forecast for the next few days"""
-    base_weather = get_weather_data_for_region(region_name)
-    current_month = datetime.now().month
-    
-    # Get current month's typical weather
-    current_month_data = base_weather['monthly_temp'][current_month - 1]
-    current_rainfall_data = base_weather['monthly_rainfall'][current_month - 1]
-    
-    forecast = []
-    for day in range(days):
-        date = datetime.now() + timedelta(days=day)
-        
-        # Add some daily variation
-        temp_variation = random.uniform(-3, 3)
-        rain_chance = random.uniform(0, 100)
-        
-        forecast.append({
-            'date': date.strftime('%Y-%m-%d'),
-            'min_temp': current_month_data['min_temp'] + temp_variation,
-            'max_temp': current_month_data['max_temp'] + temp_variation,
-            'rainfall': current_rainfall_data['rainfall'] / 30 if rain_chance > 70 else 0,
-            'humidity': base_weather['avg_humidity'] + random.uniform(-10, 10)
-        })
+    from data.weather_forecast import get_forecast_service  # Built on top of this module
     
-    return forecast
+    forecast = get_forecast_service().forecast_frame([region_name], days)
+    forecast['date'] = forecast['date'].dt.strftime('%Y-%m-%d')
+    return forecast.drop(columns='region').to_dict('records')
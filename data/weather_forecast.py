@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from data.weather_data import WEATHER_VARIABLES
+from data.climate_normals import get_climate_normals
+
+# Longest supported horizon, about one growing season
+MAX_FORECAST_DAYS = 180
+
+FORECAST_VARIABLES = ('min_temp', 'max_temp', 'rainfall', 'humidity')
+
+class WeatherForecastService:
+    """
+    Daily forecasts for many regions at once, drawn around each region's
+    monthly climatology. Climatologies are cached per region and refreshed
+    when the shared climate normals change.
+    """
+
+    def __init__(self):
+        self._normals_version = None
+        self._climatology = {}
+
+    def climatology(self, region_names):
+        """(regions, months, variables) array of mean monthly weather"""
+        normals = get_climate_normals(region_names)
+        if normals.version != self._normals_version:
+            self._climatology.clear()
+            self._normals_version = normals.version
+
+        missing = [name for name in dict.fromkeys(region_names) if name not in self._climatology]
+        if missing:
+            rows = [normals.region_index[name] for name in missing]
+            for name, monthly in zip(missing, normals.mean[rows]):
+                monthly.flags.writeable = False
+                self._climatology[name] = monthly
+
+        return np.stack([self._climatology[name] for name in region_names])
+
+    def forecast_arrays(self, region_names, days=7, start=None, seed=None):
+        """
+        Forecast of the given horizon for every region as (regions, days)
+        arrays keyed by variable, plus the forecast dates. A seed makes the
+        forecast reproducible.
+        """
+        if not 0 < days <= MAX_FORECAST_DAYS:
+            raise ValueError(f"Forecast horizon must be between 1 and {MAX_FORECAST_DAYS} days")
+
+        start = np.datetime64(start if start is not None else datetime.now().date(), 'D')
+        dates = start + np.arange(days)
+        months = dates.astype('datetime64[M]').astype(int) % 12
+        typical = self.climatology(region_names)[:, months]
+
+        def column(variable):
+            return typical[..., WEATHER_VARIABLES.index(variable)]
+
+        # Add some daily variation
+        rng = np.random.default_rng(seed)
+        shape = (len(region_names), days)
+        temp_variation = rng.uniform(-3, 3, shape)
+        rain_chance = rng.uniform(0, 100, shape)
+        humidity_variation = rng.uniform(-10, 10, shape)
+
+        return {
+            'dates': dates,
+            'min_temp': column('min_temp') + temp_variation,
+            'max_temp': column('max_temp') + temp_variation,
+            'rainfall': np.where(rain_chance > 70, column('rainfall') / 30, 0.0),
+            'humidity': column('humidity') + humidity_variation
+        }
+
+    def forecast_frame(self, region_names, days=7, start=None, seed=None):
+        """Forecast as a long DataFrame with one row per region and date"""
+        forecast = self.forecast_arrays(region_names, days, start, seed)
+        frame = pd.DataFrame({
+            'region': np.repeat(np.asarray(region_names, dtype=object), days),
+            'date': np.tile(forecast['dates'], len(region_names))
+        })
+        for variable in FORECAST_VARIABLES:
+            frame[variable] = forecast[variable].ravel()
+        return frame
+
+_forecast_service = None
+
+def get_forecast_service():
+    global _forecast_service
+    if _forecast_service is None:
+        _forecast_service = WeatherForecastService()
+    return _forecast_service
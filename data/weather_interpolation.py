@@ -0,0 +1,97 @@
+import numpy as np
+from functools import lru_cache
+from scipy import sparse
+from scipy.spatial import cKDTree
+from data.regions_data import get_indian_states_data
+from data.climate_normals import get_climate_normals
+from data.spatial_index import _unit_vectors, chord_to_km, resolve_location
+from data.weather_data import _weather_dict
+
+# Neighbours and distance power of the inverse-distance weighting
+IDW_NEIGHBOURS = 6
+IDW_POWER = 2
+# Targets closer than this (km) to a source take its values unchanged
+EXACT_MATCH_KM = 0.01
+
+class WeatherInterpolator:
+    """
+    Inverse-distance-weighted estimates of monthly weather at any coordinate
+    from the series of surrounding sources (stations, blocks or states).
+    Weights of single points are cached; batches are one sparse product.
+    """
+
+    def __init__(self, source_lat, source_lon, source_values, neighbours=IDW_NEIGHBOURS, power=IDW_POWER, cache_size=4096):
+        self.source_lat = np.asarray(source_lat, dtype=float)
+        self.source_lon = np.asarray(source_lon, dtype=float)
+        self.source_values = np.asarray(source_values, dtype=float)
+        self.neighbours = min(neighbours, len(self.source_lat))
+        self.power = power
+        self.tree = cKDTree(_unit_vectors(self.source_lat, self.source_lon))
+        self._flat_values = self.source_values.reshape(len(self.source_lat), -1)
+        self.point_weights = lru_cache(maxsize=cache_size)(self._point_weights)
+
+    def neighbour_weights(self, lats, lons):
+        """Neighbour indices and normalized weights of every target, as (targets, neighbours) arrays"""
+        points = _unit_vectors(np.asarray(lats, dtype=float), np.asarray(lons, dtype=float)).reshape(-1, 3)
+        chords, indices = self.tree.query(points, k=self.neighbours)
+        distances = chord_to_km(chords).reshape(len(points), -1)
+        indices = indices.reshape(len(points), -1)
+
+        exact = distances < EXACT_MATCH_KM
+        with np.errstate(divide='ignore'):
+            weights = np.where(exact.any(axis=1, keepdims=True), exact.astype(float), distances ** -float(self.power))
+        return indices, weights / weights.sum(axis=1, keepdims=True)
+
+    def _point_weights(self, lat, lon):
+        indices, weights = self.neighbour_weights([lat], [lon])
+        return indices[0], weights[0]
+
+    def weight_matrix(self, lats, lons):
+        """Sparse (targets, sources) interpolation matrix"""
+        indices, weights = self.neighbour_weights(lats, lons)
+        rows = np.repeat(np.arange(len(indices)), indices.shape[1])
+        return sparse.csr_matrix(
+            (weights.ravel(), (rows, indices.ravel())),
+            shape=(len(indices), len(self.source_lat))
+        )
+
+    def interpolate(self, lat, lon):
+        """Values at one coordinate, shaped like one source's series"""
+        indices, weights = self.point_weights(round(float(lat), 4), round(float(lon), 4))
+        return np.tensordot(weights, self.source_values[indices], axes=1)
+
+    def interpolate_bulk(self, lats, lons):
+        """Values at many coordinates, as (targets,) + one source's series shape"""
+        estimates = self.weight_matrix(lats, lons) @ self._flat_values
+        return estimates.reshape((-1,) + self.source_values.shape[1:])
+
+def build_state_interpolator(normals=None):
+    """Interpolator over the state centres and their monthly climate normals"""
+    states = get_indian_states_data()
+    names = [state['name'] for state in states]
+    normals = normals or get_climate_normals(names)
+    return WeatherInterpolator(
+        [state['lat'] for state in states],
+        [state['lon'] for state in states],
+        np.stack([normals.monthly_normals(name) for name in names])
+    )
+
+_interpolator = None
+
+def get_weather_interpolator():
+    """Shared state-level interpolator, rebuilt when the climate normals change"""
+    global _interpolator
+    normals = get_climate_normals([state['name'] for state in get_indian_states_data()])
+    version = normals.version
+    if _interpolator is None or _interpolator[0] != version:
+        _interpolator = (version, build_state_interpolator(normals))
+    return _interpolator[1]
+
+def get_weather_data_for_location(lat, lon, name=None):
+    """
+    Weather dict of the normal year at a coordinate, shaped like
+    get_weather_data_for_region; growing seasons follow the nearest state
+    """
+    location = resolve_location(lat, lon)
+    monthly = get_weather_interpolator().interpolate(lat, lon)
+    return _weather_dict(name or location['name'], monthly, location['state'])
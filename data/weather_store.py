@@ -0,0 +1,194 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from data.weather_data import WEATHER_VARIABLES, _weather_dict
+
+# Daily variables kept in the store, one float32 (blocks, days) file each
+DAILY_VARIABLES = ('min_temp', 'max_temp', 'rainfall', 'humidity')
+
+# IMD-style CSV headers mapped to store columns (matched case-insensitively)
+IMD_COLUMNS = {
+    'block': 'block', 'block_name': 'block',
+    'date': 'date',
+    'tmin': 'min_temp', 'min_temp': 'min_temp',
+    'tmax': 'max_temp', 'max_temp': 'max_temp',
+    'rainfall': 'rainfall', 'rain': 'rainfall', 'rf': 'rainfall',
+    'rh': 'humidity', 'humidity': 'humidity'
+}
+
+# IMD definition of a rainy day
+RAINY_DAY_MM = 2.5
+
+META_FILE = 'store.json'
+
+class WeatherStore:
+    """
+    Memory-mapped columnar store of block-level daily weather. Each variable
+    is a float32 (blocks, days) file; missing observations are NaN.
+    """
+
+    def __init__(self, path, mode='r'):
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+        self.path = path
+        self.blocks = meta['blocks']
+        self.states = meta['states']
+        self.variables = tuple(meta['variables'])
+        self.start = np.datetime64(meta['start'], 'D')
+        self.days = meta['days']
+        self.block_index = {name: i for i, name in enumerate(self.blocks)}
+        self.columns = {
+            variable: np.memmap(
+                os.path.join(path, f'{variable}.f32'), dtype=np.float32,
+                mode=mode, shape=(len(self.blocks), self.days)
+            )
+            for variable in self.variables
+        }
+
+    @classmethod
+    def create(cls, path, blocks, start, end, states=None, variables=DAILY_VARIABLES):
+        """Create an empty store for blocks over the days [start, end]"""
+        start = np.datetime64(start, 'D')
+        days = int((np.datetime64(end, 'D') - start).astype(int)) + 1
+        os.makedirs(path, exist_ok=True)
+        meta = {
+            'blocks': list(blocks),
+            'states': list(states) if states is not None else [None] * len(blocks),
+            'variables': list(variables),
+            'start': str(start),
+            'days': days
+        }
+        for variable in variables:
+            column = np.memmap(
+                os.path.join(path, f'{variable}.f32'), dtype=np.float32,
+                mode='w+', shape=(len(blocks), days)
+            )
+            column[:] = np.nan
+            column.flush()
+            del column
+        with open(os.path.join(path, META_FILE), 'w') as f:
+            json.dump(meta, f)
+        return cls(path, mode='r+')
+
+    def flush(self):
+        for column in self.columns.values():
+            column.flush()
+
+    def day_index(self, dates):
+        """Day offsets of dates from the start of the store"""
+        return (np.asarray(dates, dtype='datetime64[D]') - self.start).astype(np.int64)
+
+    def year_slice(self, year):
+        """Slice of days covering one calendar year"""
+        first, last = self.day_index([f'{year}-01-01', f'{year + 1}-01-01'])
+        return slice(int(first), int(last))
+
+    def daily(self, variable, block, start=None, end=None):
+        """Zero-copy view of one block's daily values of a variable over [start, end)"""
+        first = 0 if start is None else int(self.day_index(start))
+        last = self.days if end is None else int(self.day_index(end))
+        return self.columns[variable][self.block_index[block], first:last]
+
+    def covers(self, block, year):
+        """
+        Whether the store holds observations of block for every day of year
+        in every variable; partially ingested years are not covered, so callers
+        fall back to synthetic weather instead of averaging over gaps
+        """
+        days = self.year_slice(year)
+        if block not in self.block_index or days.start < 0 or days.stop > self.days:
+            return False
+        row = self.block_index[block]
+        return all(bool(np.isfinite(self.columns[variable][row, days]).all()) for variable in self.variables)
+
+    def latest_covered_year(self, block):
+        """Most recent year the store covers for block (see covers), or None"""
+        first = int(str(self.start)[:4])
+        last = int(str(self.start + np.timedelta64(self.days - 1, 'D'))[:4])
+        for year in range(last, first - 1, -1):
+            if self.covers(block, year):
+                return year
+        return None
+
+    def monthly_cube(self, year, blocks=None):
+        """
+        (blocks, months, variables) array of monthly weather for one year,
+        aggregated from the daily columns in WEATHER_VARIABLES order
+        """
+        rows = slice(None) if blocks is None else [self.block_index[name] for name in blocks]
+        days = self.year_slice(year)
+        month_starts = (
+            np.arange(f'{year}-01', f'{year + 1}-01', dtype='datetime64[M]').astype('datetime64[D]')
+            - np.datetime64(f'{year}-01-01', 'D')
+        ).astype(np.int64)
+
+        def aggregate(variable, reduce):
+            daily = self.columns[variable][rows, days]
+            observed = ~np.isnan(daily)
+            totals = np.add.reduceat(np.where(observed, daily, 0.0), month_starts, axis=1, dtype=float)
+            if reduce == 'sum':
+                return totals
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return totals / np.add.reduceat(observed, month_starts, axis=1)
+
+        min_temp = aggregate('min_temp', 'mean')
+        max_temp = aggregate('max_temp', 'mean')
+        if 'avg_temp' in self.columns:
+            avg_temp = aggregate('avg_temp', 'mean')
+        else:
+            avg_temp = (min_temp + max_temp) / 2
+        rainfall = aggregate('rainfall', 'sum')
+        humidity = aggregate('humidity', 'mean')
+        rainy = self.columns['rainfall'][rows, days] >= RAINY_DAY_MM
+        rainy_days = np.add.reduceat(rainy, month_starts, axis=1).astype(float)
+
+        monthly = {
+            'min_temp': min_temp, 'avg_temp': avg_temp, 'max_temp': max_temp,
+            'rainfall': rainfall, 'humidity': humidity, 'rainy_days': rainy_days
+        }
+        return np.stack([monthly[variable] for variable in WEATHER_VARIABLES], axis=-1)
+
+    def monthly(self, block, year):
+        """(months, variables) array of one block and year"""
+        return self.monthly_cube(year, [block])[0]
+
+    def region_weather(self, block, year):
+        """Weather dict of one block and year, as returned by get_weather_data_for_region"""
+        return _weather_dict(block, self.monthly(block, year), self.states[self.block_index[block]])
+
+def ingest_weather_csv(store, csv_path, chunksize=250_000, column_map=None, date_format=None):
+    """
+    Stream a daily weather CSV into store chunk by chunk. Rows for unknown
+    blocks or dates outside the store are skipped. Returns row counts.
+    """
+    column_map = {**IMD_COLUMNS, **(column_map or {})}
+    column_map = {key.lower(): value for key, value in column_map.items()}
+    block_lookup = pd.Index(store.blocks)
+    written = skipped = 0
+
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+        chunk = chunk.rename(columns=lambda name: column_map.get(name.strip().lower(), name))
+        rows = block_lookup.get_indexer(chunk['block'])
+        dates = pd.to_datetime(chunk['date'], format=date_format).to_numpy().astype('datetime64[D]')
+        days = store.day_index(dates)
+        valid = (rows >= 0) & (days >= 0) & (days < store.days)
+        rows, days = rows[valid], days[valid]
+
+        for variable in store.variables:
+            if variable in chunk:
+                values = pd.to_numeric(chunk[variable], errors='coerce').to_numpy(np.float32)
+                store.columns[variable][rows, days] = values[valid]
+
+        written += int(valid.sum())
+        skipped += int((~valid).sum())
+
+    store.flush()
+    return {'rows': written, 'skipped': skipped}
+
+def build_weather_store(path, csv_paths, blocks, start, end, states=None, **ingest_options):
+    """Create a store at path and ingest the given daily weather CSVs into it"""
+    store = WeatherStore.create(path, blocks, start, end, states=states)
+    for csv_path in csv_paths:
+        ingest_weather_csv(store, csv_path, **ingest_options)
+    return store
@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from utils.recommendation_engine import CropRecommendationEngine
+from utils.recommendation_engine import get_recommendation_engine
 
 def show_crop_recommendations_page():
     st.title("Advanced Crop Recommendations")
@@ -22,7 +22,7 @@ def show_crop_recommendations_page():
         max_investment = st.number_input("Max Investment per acre (₹)", min_value=1000, value=50000, step=5000)
     
     # Get filtered recommendations
-    engine = CropRecommendationEngine()
+    engine = get_recommendation_engine()
     recommendations = engine.get_filtered_recommendations(
         st.session_state.selected_region,
         crop_type=crop_type,
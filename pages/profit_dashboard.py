@@ -37,14 +37,14 @@ def show_profit_dashboard_page():
             st.success(f"Remaining land: {remaining_land:.1f} acres")
             
             # Calculate portfolio performance
+            recommendations_by_name = {crop['name']: crop for crop in st.session_state.recommendations}
             total_investment = 0
             total_revenue = 0
             portfolio_data = []
             
             for crop_name, allocation in portfolio_allocations.items():
                 if allocation > 0:
-                    crop_details = next(crop for crop in st.session_state.recommendations 
-                                      if crop['name'] == crop_name)
+                    crop_details = recommendations_by_name[crop_name]
                     
                     investment = crop_details['production_cost'] * allocation
                     revenue = crop_details['expected_yield'] * crop_details['market_price'] * allocation
@@ -101,8 +101,7 @@ def show_profit_dashboard_page():
                 crop_risks = []
                 for crop_name in selected_crops:
                     if portfolio_allocations[crop_name] > 0:
-                        crop_details = next(crop for crop in st.session_state.recommendations 
-                                          if crop['name'] == crop_name)
+                        crop_details = recommendations_by_name[crop_name]
                         
                         # Simple risk calculation based on weather sensitivity
                         weather_risk = 10 - crop_details['suitability_score']  # Higher suitability = lower risk
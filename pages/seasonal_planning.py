@@ -5,7 +5,7 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 import calendar
-from data.seasonal_calendar import get_regional_calendar, get_seasonal_conflicts, get_market_timing_analysis
+from data.seasonal_calendar import get_regional_calendar, get_seasonal_conflicts, get_market_timing_analysis, get_calendar_month_masks
 
 
 def show_seasonal_planning_page():
@@ -175,8 +175,9 @@ def show_seasonal_planning_page():
     current_month = datetime.now().month
     next_month = (current_month % 12) + 1
     
-    current_recommendations = get_seasonal_recommendations(regional_calendar, current_month)
-    next_recommendations = get_seasonal_recommendations(regional_calendar, next_month)
+    calendar_masks = get_calendar_month_masks(regional_calendar)
+    current_recommendations = get_seasonal_recommendations(calendar_masks, current_month)
+    next_recommendations = get_seasonal_recommendations(calendar_masks, next_month)
     
     col1, col2 = st.columns(2)
     
@@ -428,26 +429,16 @@ def calculate_resource_requirements(selected_crops: list, allocation_data: list)
     
     return total_requirements
 
-def get_seasonal_recommendations(regional_calendar: dict, month: int) -> dict:
+def get_seasonal_recommendations(calendar_masks: tuple, month: int) -> dict:
     """Get planting and harvesting recommendations for a specific month"""
     
-    recommendations = {
-        'planting': [],
-        'harvesting': []
-    }
+    crop_names, planting_masks, harvesting_masks = calendar_masks
+    month_bit = 1 << (month - 1)
     
-    for crop_name, crop_data in regional_calendar.items():
-        for season_name, season_data in crop_data.get('seasons', {}).items():
-            planting_months = season_data.get('planting_months', [])
-            harvesting_months = season_data.get('harvesting_months', [])
-            
-            if month in planting_months:
-                recommendations['planting'].append(crop_name)
-            
-            if month in harvesting_months:
-                recommendations['harvesting'].append(crop_name)
-    
-    return recommendations
+    return {
+        'planting': crop_names[(planting_masks & month_bit) != 0].tolist(),
+        'harvesting': crop_names[(harvesting_masks & month_bit) != 0].tolist()
+    }
 
 def create_calendar_csv(regional_calendar: dict, year: int) -> str:
     """Create CSV data for calendar export"""
@@ -146,6 +146,9 @@ def show_soil_analysis_page():
     
     improvement_plan = get_soil_improvement_plan(region_soil, target_crops)
     
+    if improvement_plan['estimated_costs']['total_per_hectare'] > 0:
+        st.metric("Estimated Improvement Cost", f"₹{improvement_plan['estimated_costs']['total_per_hectare']:,.0f} per hectare")
+    
     # Display improvement actions
     if improvement_plan['immediate_actions']:
         st.write("**Immediate Actions Required:**")
@@ -186,6 +189,11 @@ def show_soil_analysis_page():
                 if 'timeline' in strategy:
                     st.write(f"**Timeline:** {strategy['timeline']}")
     
+    if improvement_plan['timeline']:
+        st.write("**Timeline:**")
+        for phase, actions in improvement_plan['timeline'].items():
+            st.write(f"- **{phase}:** {', '.join(actions)}")
+    
     # Regional Soil Trends
     st.subheader("Regional Soil Health Trends")
     
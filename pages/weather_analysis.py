@@ -31,10 +31,11 @@ def show_weather_analysis_page():
     # Historical trends
     st.subheader("30-Year Historical Trends")
     
-    trends_df = pd.DataFrame(weather_analysis['historical_trends'])
+    period = st.select_slider("Years shown", options=[10, 20, 30], value=30)
+    trends_df = pd.DataFrame(weather_analysis.history(last=period))
     
     fig_trends = px.line(trends_df, x='year', y=['temperature', 'rainfall'],
-                        title="Temperature and Rainfall Trends (1994-2024)")
+                        title=f"Temperature and Rainfall Trends ({trends_df['year'].min()}-{trends_df['year'].max()})")
     st.plotly_chart(fig_trends, use_container_width=True)
     
     # Seasonal analysis
@@ -0,0 +1,21 @@
+import numpy as np
+from data.climate_extremes import ClimateExtremes, get_climate_extremes
+
+def test_dry_states_score_above_wet_ones():
+    extremes = get_climate_extremes(['Rajasthan', 'West Bengal', 'Kerala'])
+    drought = {name: extremes.region_risks(name)['drought']['probability']
+               for name in ('Rajasthan', 'West Bengal', 'Kerala')}
+    assert drought['Rajasthan'] > drought['West Bengal']
+    assert drought['Rajasthan'] > drought['Kerala']
+    assert (extremes.region_risks('West Bengal')['flood']['probability']
+            > extremes.region_risks('Rajasthan')['flood']['probability'])
+
+def test_thresholds_are_shared_across_regions():
+    rng = np.random.default_rng(0)
+    rainfall = np.stack([rng.gamma(50, scale, 30) for scale in (10, 30, 60)])
+    heat_days = np.stack([rng.uniform(30, 60, 30), rng.uniform(5, 15, 30), rng.uniform(0, 10, 30)])
+    extremes = ClimateExtremes(['Dry', 'Moderate', 'Wet'], range(30), rainfall, np.full((3, 30), 25.0), heat_days)
+    assert extremes.drought_probability[0] > extremes.drought_probability[2]
+    assert extremes.flood_probability[2] > extremes.flood_probability[0]
+    assert extremes.heatwave_probability[0] > 0.25
+    assert extremes.heatwave_probability[2] == 0
@@ -0,0 +1,17 @@
+import pytest
+from data.crop_database import parse_growing_season, month_span_mask, ALL_SEASONS, ALL_MONTHS, SEASON_FLAGS
+
+def test_month_span():
+    flags, months = parse_growing_season('Rabi (Nov-Apr)')
+    assert flags == SEASON_FLAGS['Rabi']
+    assert months == month_span_mask(11, 4)
+
+def test_year_round():
+    assert parse_growing_season('Year-round') == (ALL_SEASONS, ALL_MONTHS)
+
+@pytest.mark.parametrize('growing_season', ['Rabi (Nvo-Apr)', 'Kharif (Year-round)', 'Kharif (Jun-Aug-Sep)'])
+def test_unrecognised_months_fall_back_to_all_months(growing_season):
+    with pytest.warns(UserWarning):
+        flags, months = parse_growing_season(growing_season)
+    assert flags != 0
+    assert months == ALL_MONTHS
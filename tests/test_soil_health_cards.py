@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+from data.soil_health_cards import encode_health_cards, health_card_profiles, SALINITY_CATEGORIES
+
+def _cards(ec):
+    return pd.DataFrame({
+        'farm_id': [1, 2],
+        'nitrogen': [300, 300],
+        'phosphorus': [12, 12],
+        'potassium': [150, 150],
+        'ph': [6.9, 6.9],
+        'ec': ec
+    })
+
+def test_missing_ec_is_encoded_as_unknown():
+    encoded = encode_health_cards(_cards([0.5, np.nan]))
+    assert encoded['salinity'].tolist() == [0, len(SALINITY_CATEGORIES)]
+
+def test_missing_ec_leaves_salinity_out_of_profile():
+    measured, missing = health_card_profiles(_cards([3.5, None]))
+    assert measured['salinity_level'] == 'High'
+    assert 'salinity_level' not in missing
@@ -0,0 +1,14 @@
+from data.spatial_index import LocationIndex, default_locations
+
+def test_nearest_caps_k_at_number_of_locations():
+    index = LocationIndex(default_locations())
+    nearest = index.nearest(30.9, 75.85, k=len(index) + 100)
+    assert len(nearest) == len(index)
+    assert nearest[0]['name'] == 'Ludhiana'
+    distances = [location['distance_km'] for location in nearest]
+    assert distances == sorted(distances)
+
+def test_query_bulk_caps_k():
+    index = LocationIndex(default_locations()[:3])
+    indices, distances = index.query_bulk([20.0, 25.0], [78.0, 80.0], k=10)
+    assert indices.shape == distances.shape == (2, 3)
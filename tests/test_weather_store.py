@@ -0,0 +1,29 @@
+from data.weather_store import WeatherStore
+from data.weather_data import set_weather_store, get_weather_data_for_region
+
+def _store(path):
+    store = WeatherStore.create(str(path), ['Jaisalmer', 'Unobserved'], '2023-01-01', '2025-06-30',
+                                states=['Rajasthan', 'Rajasthan'])
+    row = store.block_index['Jaisalmer']
+    observed = store.year_slice(2024).stop
+    for variable in store.variables:
+        store.columns[variable][row, :observed] = 20.0
+    store.columns['rainfall'][row, :observed] = 0.5
+    store.columns['min_temp'][row, observed:observed + 30] = 15.0  # Partial current year
+    return store
+
+def test_latest_covered_year_skips_partial_year(tmp_path):
+    store = _store(tmp_path)
+    assert store.latest_covered_year('Jaisalmer') == 2024
+    assert store.latest_covered_year('Unobserved') is None
+
+def test_store_blocks_default_to_latest_observed_year(tmp_path):
+    set_weather_store(_store(tmp_path))
+    try:
+        weather = get_weather_data_for_region('Jaisalmer')
+        assert weather['annual_rainfall'] == 0.5 * 366
+        fallback = get_weather_data_for_region('Unobserved', year=2024)
+    finally:
+        set_weather_store(None)
+    assert fallback['region'] == 'Unobserved'
+    assert fallback['annual_rainfall'] == get_weather_data_for_region('Rajasthan', year=2024)['annual_rainfall']
@@ -1,107 +1,63 @@
-import pandas as pd
 import numpy as np
-from scipy import stats
 from data.weather_data import get_weather_data_for_region
-from data.crop_database import get_crop_database
+from data.climate_normals import get_climate_normals
+from data.climate_extremes import get_climate_extremes
+from data.crop_database import get_crop_database, get_crop_catalog
+from utils.trend_engine import compute_trends
+
+# Yearly slopes (degC, mm) within which a weather trend is reported as stable
+STABLE_TEMP_SLOPE = 0.005
+STABLE_RAINFALL_SLOPE = 0.5
+
+def _trend_summary(trends, row, stable_slope=0.0):
+    """Direction, significance and fit of one series of a compute_trends result"""
+    slope = float(trends['slope'][row])
+    if abs(slope) <= stable_slope:
+        direction = 'stable'
+    else:
+        direction = 'increasing' if slope > 0 else 'decreasing'
+    return {
+        'slope': slope,
+        'direction': direction,
+        'significance': 'significant' if trends['p_value'][row] < 0.05 else 'not significant',
+        'r_squared': float(trends['r_squared'][row])
+    }
 
 class WeatherDataAnalyzer:
     def __init__(self):
         pass
     
-    def analyze_weather_trends(self, region_name, years=30):
+    def analyze_weather_trends(self, region_name, years=30, method='ols'):
         """Analyze long-term weather trends for a region"""
-        
-        # Get current weather data
-        current_weather = get_weather_data_for_region(region_name)
-        
-        # Generate historical trend data
-        historical_data = []
-        base_temp = current_weather['avg_temp']
-        base_rainfall = current_weather['annual_rainfall']
-        
-        for year in range(years):
-            # Add some trend and random variation
-            temp_trend = year * 0.02  # Slight warming trend
-            rainfall_trend = year * (1 if base_rainfall < 1000 else -2)  # Rainfall change
-            
-            temp = base_temp + temp_trend + np.random.normal(0, 1)
-            rainfall = base_rainfall + rainfall_trend + np.random.normal(0, 100)
-            
-            historical_data.append({
-                'year': 2024 - years + year,
-                'temperature': max(15, min(45, temp)),
-                'rainfall': max(100, min(3000, rainfall))
-            })
-        
-        df = pd.DataFrame(historical_data)
-        
-        # Calculate trends
-        temp_slope, temp_intercept, temp_r, temp_p, temp_se = stats.linregress(df['year'], df['temperature'])
-        rain_slope, rain_intercept, rain_r, rain_p, rain_se = stats.linregress(df['year'], df['rainfall'])
-        
-        analysis = {
-            'data': historical_data,
-            'temperature_trend': {
-                'slope': temp_slope,
-                'direction': 'increasing' if temp_slope > 0 else 'decreasing',
-                'significance': 'significant' if temp_p < 0.05 else 'not significant',
-                'r_squared': temp_r**2
-            },
-            'rainfall_trend': {
-                'slope': rain_slope,
-                'direction': 'increasing' if rain_slope > 0 else 'decreasing',
-                'significance': 'significant' if rain_p < 0.05 else 'not significant',
-                'r_squared': rain_r**2
+        return self.analyze_weather_trends_batch([region_name], years, method)[region_name]
+    
+    def analyze_weather_trends_batch(self, region_names, years=30, method='ols'):
+        """Analyze long-term weather trends for many regions in one trend pass"""
+        
+        # Yearly series of the climate normals window, the history the weather page charts
+        year_list, series = get_climate_normals(region_names).annual_cube(region_names, last=years)
+        temperature, rainfall = series['avg_temp'], series['rainfall']
+        
+        # Calculate trends: temperature rows first, then rainfall rows
+        trends = compute_trends(np.vstack([temperature, rainfall]), year_list, method)
+        
+        analyses = {}
+        for i, region_name in enumerate(region_names):
+            historical_data = [
+                {'year': year, 'temperature': temp, 'rainfall': rain}
+                for year, temp, rain in zip(year_list, temperature[i].tolist(), rainfall[i].tolist())
+            ]
+            analyses[region_name] = {
+                'data': historical_data,
+                'temperature_trend': _trend_summary(trends, i, STABLE_TEMP_SLOPE),
+                'rainfall_trend': _trend_summary(trends, len(region_names) + i, STABLE_RAINFALL_SLOPE)
             }
-        }
         
-        return analysis
+        return analyses
     
     def calculate_climate_extremes(self, region_name):
-        """Calculate climate extreme events probability"""
-        
-        weather_data = get_weather_data_for_region(region_name)
-        
-        # Drought risk calculation
-        annual_rainfall = weather_data['annual_rainfall']
-        if annual_rainfall < 500:
-            drought_risk = 'High'
-            drought_probability = 40
-        elif annual_rainfall < 750:
-            drought_risk = 'Medium'
-            drought_probability = 20
-        else:
-            drought_risk = 'Low'
-            drought_probability = 5
-        
-        # Heat wave risk
-        avg_temp = weather_data['avg_temp']
-        if avg_temp > 35:
-            heatwave_risk = 'High'
-            heatwave_probability = 30
-        elif avg_temp > 30:
-            heatwave_risk = 'Medium'
-            heatwave_probability = 15
-        else:
-            heatwave_risk = 'Low'
-            heatwave_probability = 5
-        
-        # Flood risk
-        if annual_rainfall > 2000:
-            flood_risk = 'High'
-            flood_probability = 25
-        elif annual_rainfall > 1500:
-            flood_risk = 'Medium'
-            flood_probability = 10
-        else:
-            flood_risk = 'Low'
-            flood_probability = 3
-        
-        return {
-            'drought': {'risk': drought_risk, 'probability': drought_probability},
-            'heatwave': {'risk': heatwave_risk, 'probability': heatwave_probability},
-            'flood': {'risk': flood_risk, 'probability': flood_probability}
-        }
+        """Calculate climate extreme events probability from the region's historical record"""
+        return get_climate_extremes([region_name]).region_risks(region_name)
     
     def analyze_seasonal_variability(self, region_name):
         """Analyze seasonal weather variability"""
@@ -145,11 +101,12 @@ class WeatherDataAnalyzer:
 class CropSuitabilityAnalyzer:
     def __init__(self):
         self.crops_db = get_crop_database()
+        self.catalog = get_crop_catalog()
     
     def analyze_crop_climate_match(self, crop_name, region_name):
         """Detailed analysis of crop-climate compatibility"""
         
-        crop_data = next((crop for crop in self.crops_db if crop['name'] == crop_name), None)
+        crop_data = self.catalog.get(crop_name)
         if not crop_data:
             return None
         
@@ -203,7 +160,7 @@ class CropSuitabilityAnalyzer:
     def find_alternative_crops(self, failed_crop, region_name, num_alternatives=5):
         """Find alternative crops if one fails"""
         
-        failed_crop_data = next((crop for crop in self.crops_db if crop['name'] == failed_crop), None)
+        failed_crop_data = self.catalog.get(failed_crop)
         if not failed_crop_data:
             return []
         
@@ -239,53 +196,62 @@ class MarketAnalyzer:
     def __init__(self):
         pass
     
-    def analyze_price_trends(self, crop_name, years=5):
+    # Base prices of the simulated price series
+    BASE_PRICES = {
+        'Rice (Basmati)': 4500, 'Wheat': 2200, 'Maize': 1800,
+        'Chana (Chickpea)': 5500, 'Soybean': 4200, 'Cotton': 6000,
+        'Tomato': 2500, 'Potato': 1200, 'Onion': 1800
+    }
+    
+    def analyze_price_trends(self, crop_name, years=5, method='ols'):
         """Analyze price trends for a crop (simulated data)"""
+        return self.analyze_price_trends_batch([crop_name], years, method)[crop_name]
+    
+    def analyze_price_trends_batch(self, crop_names, years=5, method='ols'):
+        """Analyze price trends for many crops (simulated data) in one trend pass"""
         
-        # Simulate price data with trends
-        base_price = {
-            'Rice (Basmati)': 4500, 'Wheat': 2200, 'Maize': 1800,
-            'Chana (Chickpea)': 5500, 'Soybean': 4200, 'Cotton': 6000,
-            'Tomato': 2500, 'Potato': 1200, 'Onion': 1800
-        }.get(crop_name, 3000)
-        
-        price_data = []
-        for year in range(years):
-            # Add trend and seasonal variation
-            trend = year * 100  # Inflation
-            seasonal_var = np.random.normal(0, base_price * 0.1)
-            annual_price = base_price + trend + seasonal_var
-            
-            price_data.append({
-                'year': 2024 - years + year,
-                'price': max(500, annual_price)
-            })
+        # Simulate price data with trend (inflation) and seasonal variation
+        base_price = np.array([self.BASE_PRICES.get(name, 3000) for name in crop_names], dtype=float)
+        year_list = np.arange(2024 - years, 2024)
+        seasonal_var = np.random.normal(0, base_price[:, None] * 0.1, (len(crop_names), years))
+        prices = np.maximum(500, base_price[:, None] + np.arange(years) * 100 + seasonal_var)
         
         # Calculate trend
-        prices = [p['price'] for p in price_data]
-        years_list = [p['year'] for p in price_data]
-        
-        if len(prices) > 1:
-            slope, intercept, r, p_value, se = stats.linregress(years_list, prices)
-            trend_direction = 'Increasing' if slope > 0 else 'Decreasing'
-            trend_strength = 'Strong' if abs(r) > 0.7 else 'Moderate' if abs(r) > 0.3 else 'Weak'
+        if years > 1:
+            trends = compute_trends(prices, year_list, method)
+            slopes, r = trends['slope'], np.abs(trends['r'])
         else:
-            slope, trend_direction, trend_strength = 0, 'Stable', 'Weak'
+            slopes, r = np.zeros(len(crop_names)), np.zeros(len(crop_names))
         
-        return {
-            'crop': crop_name,
-            'price_data': price_data,
-            'current_price': prices[-1] if prices else base_price,
-            'trend': {
-                'direction': trend_direction,
-                'strength': trend_strength,
-                'annual_change': round(slope, 2)
-            },
-            'volatility': {
-                'coefficient': round(np.std(prices) / np.mean(prices) * 100, 2) if prices else 0,
-                'assessment': 'High' if np.std(prices) / np.mean(prices) > 0.2 else 'Medium' if np.std(prices) / np.mean(prices) > 0.1 else 'Low'
+        variation = prices.std(axis=1) / prices.mean(axis=1) if years > 0 else np.zeros(len(crop_names))
+        
+        analyses = {}
+        for i, crop_name in enumerate(crop_names):
+            if years > 1:
+                trend_direction = 'Increasing' if slopes[i] > 0 else 'Decreasing'
+                trend_strength = 'Strong' if r[i] > 0.7 else 'Moderate' if r[i] > 0.3 else 'Weak'
+            else:
+                trend_direction, trend_strength = 'Stable', 'Weak'
+            
+            analyses[crop_name] = {
+                'crop': crop_name,
+                'price_data': [
+                    {'year': int(year), 'price': price}
+                    for year, price in zip(year_list, prices[i].tolist())
+                ],
+                'current_price': float(prices[i, -1]) if years > 0 else float(base_price[i]),
+                'trend': {
+                    'direction': trend_direction,
+                    'strength': trend_strength,
+                    'annual_change': round(float(slopes[i]), 2)
+                },
+                'volatility': {
+                    'coefficient': round(float(variation[i]) * 100, 2),
+                    'assessment': 'High' if variation[i] > 0.2 else 'Medium' if variation[i] > 0.1 else 'Low'
+                }
             }
-        }
+        
+        return analyses
     
     def calculate_market_demand_score(self, crop_type, region_name):
         """Calculate market demand score for crop type in region"""
@@ -1,190 +1,324 @@
 import pandas as pd
 import numpy as np
-from data.crop_database import get_crop_database, get_suitable_crops_for_climate
-from data.weather_data import get_weather_data_for_region
-from data.soil_analysis import get_detailed_soil_data, analyze_soil_crop_compatibility
+from data.crop_database import get_crop_catalog
+from data.climate_normals import get_climate_normals
+from data.soil_analysis import get_soil_compatibility_matrix
+from utils.cache import LRUTTLCache
+from utils.scenario_engine import ScenarioEngine, monthly_climatology
+
+# Component scores blended into the final suitability score, with their weights
+SCORE_COMPONENTS = ('climate_score', 'soil_score', 'economic_score', 'regional_score', 'market_score', 'risk_score')
+SCORE_WEIGHTS = np.array([0.25, 0.25, 0.20, 0.12, 0.10, 0.08])
+
+# Crop-region compatibility mapping
+REGIONAL_BONUSES = {
+    'Rice (Basmati)': ['Punjab', 'Haryana', 'Uttar Pradesh'],
+    'Wheat': ['Punjab', 'Haryana', 'Uttar Pradesh', 'Madhya Pradesh'],
+    'Cotton': ['Gujarat', 'Maharashtra', 'Andhra Pradesh', 'Punjab'],
+    'Sugarcane': ['Uttar Pradesh', 'Maharashtra', 'Karnataka'],
+    'Soybean': ['Madhya Pradesh', 'Maharashtra', 'Rajasthan'],
+    'Sunflower': ['Karnataka', 'Andhra Pradesh', 'Maharashtra'],
+    'Chana (Chickpea)': ['Madhya Pradesh', 'Rajasthan', 'Maharashtra'],
+    'Tomato': ['Karnataka', 'Andhra Pradesh', 'Maharashtra'],
+    'Onion': ['Maharashtra', 'Karnataka', 'Gujarat'],
+    'Chili': ['Andhra Pradesh', 'Karnataka', 'Tamil Nadu']
+}
+
+# Market demand factors based on crop type and price trends
+MARKET_FACTORS = {
+    'Pulses': 9.0,  # High demand due to protein needs
+    'Oilseeds': 8.0,  # Growing oil consumption
+    'Vegetables': 8.5,  # Urban demand growth
+    'Fruits': 7.5,  # Premium market
+    'Cereals': 7.0,  # Stable demand
+}
+
+# Water requirement risk
+WATER_RISK_SCORES = {'High': 3.0, 'Medium': 7.0, 'Low': 9.0}
+
+class RegionScores:
+    """Component scores (suitable crops x SCORE_COMPONENTS) of one scored region"""
+    
+    __slots__ = ('catalog', 'candidates', 'components', 'soil_matrix', 'soil_row', 'key')
+    
+    def __init__(self, catalog, candidates, components, soil_matrix, soil_row):
+        self.catalog = catalog
+        self.candidates = candidates
+        self.components = components
+        self.soil_matrix = soil_matrix
+        self.soil_row = soil_row
+        self.key = None
+    
+    def soil_analysis(self, crop_index):
+        """Soil analysis of a crop in this region, built on demand from the soil matrix"""
+        if self.soil_row is None:
+            return None
+        return self.soil_matrix.analysis(self.soil_row, crop_index)
 
 class CropRecommendationEngine:
-    def __init__(self):
-        self.crops_db = get_crop_database()
+    def __init__(self, cache_size=128, cache_ttl=3600, scenario_engine=None):
+        # Scored recommendations and their score matrix keyed on (region, weather fingerprint,
+        # catalog, soil and climate normals versions, top_n)
+        self.recommendation_cache = LRUTTLCache(max_size=cache_size, ttl=cache_ttl)
+        # Weather used by the region-name helper views, so they score the same inputs
+        self.weather_cache = LRUTTLCache(max_size=cache_size, ttl=cache_ttl)
+        # Latest component score matrix per region name, for re-ranking
+        self.score_matrices = LRUTTLCache(max_size=cache_size, ttl=cache_ttl)
+        self.last_region = None
+        # Seeded Monte Carlo weather scenarios behind the risk component
+        self.scenario_engine = scenario_engine or ScenarioEngine()
         
     def get_recommendations(self, region_info, weather_data, top_n=15):
         """
         Generate crop recommendations based on region, weather data, and soil analysis
         """
+        return self.get_recommendations_batch([region_info], [weather_data], top_n)[0]
+    
+    def get_recommendations_batch(self, regions, weather_list, top_n=15):
+        """
+        Generate recommendations for many regions at once.
+        Every component is scored as a regions x crops matrix and the weighted
+        blend is a single matrix product; returns one top-N list per region.
+        Regions already in the recommendation cache are not re-scored.
+        """
+        if len(regions) != len(weather_list):
+            raise ValueError(f"Got {len(regions)} regions but {len(weather_list)} weather records")
+        
+        catalog = get_crop_catalog()
+        soil_version = get_soil_compatibility_matrix().version
+        # The risk component draws its weather spread from the climate normals
+        normals = get_climate_normals([region['name'] for region in regions])
+        keys = [
+            self._cache_key(region, weather, catalog, soil_version, normals.version, top_n)
+            for region, weather in zip(regions, weather_list)
+        ]
+        results = [None] * len(keys)
+        
+        misses = []
+        for i, key in enumerate(keys):
+            cached = self.recommendation_cache.get(key)
+            if cached is not None:
+                # The score matrix may have been evicted on its own; keep it re-rankable
+                results[i], region_scores = cached
+                self.score_matrices.set(regions[i]['name'], region_scores)
+                continue
+            # Same inputs already scored with a different top_n: only re-rank
+            region_scores = self.score_matrices.get(regions[i]['name'])
+            if region_scores is not None and region_scores.key == key[1:-1]:
+                results[i] = self._rank(region_scores, region_scores.components @ SCORE_WEIGHTS, top_n)
+                self.recommendation_cache.set(key, (results[i], region_scores))
+            else:
+                misses.append(i)
         
-        # Extract climate parameters
-        avg_temp = weather_data['avg_temp']
-        annual_rainfall = weather_data['annual_rainfall']
+        if misses:
+            miss_regions = [regions[i] for i in misses]
+            scored, final_scores = self._score_regions(catalog, miss_regions, [weather_list[i] for i in misses])
+            for i, region_scores, region_final in zip(misses, scored, final_scores):
+                region_scores.key = keys[i][1:-1]
+                self.score_matrices.set(regions[i]['name'], region_scores)
+                results[i] = self._rank(region_scores, region_final, top_n)
+                self.recommendation_cache.set(keys[i], (results[i], region_scores))
         
-        # Define temperature and rainfall ranges
-        temp_range = (avg_temp - 5, avg_temp + 5)
-        rainfall_range = (annual_rainfall * 0.8, annual_rainfall * 1.2)
+        if regions:
+            self.last_region = regions[-1]['name']
         
-        # Get suitable crops based on climate
-        suitable_crops = get_suitable_crops_for_climate(temp_range, rainfall_range)
+        return [list(recommendations) for recommendations in results]
+    
+    def rerank(self, weights, top_n=15, region_name=None):
+        """
+        Re-rank a region's recommendations with custom component weights,
+        reusing its stored crops x components score matrix instead of re-scoring.
+        weights: dict keyed by SCORE_COMPONENTS names (unlisted components keep
+        their default weight) or a sequence of six weights; they are normalised
+        to sum to 1 so scores stay on the 0-10 scale.
+        region_name: defaults to the most recently scored region.
+        """
+        region_name = region_name or self.last_region
+        if region_name is None:
+            raise ValueError("No region has been scored yet")
         
-        # Get soil data for the region
-        soil_data = get_detailed_soil_data()
-        region_soil = soil_data.get(region_info['name'], {})
+        region_scores = self.score_matrices.get(region_name)
+        if region_scores is None:
+            self._region_recommendations(region_name)
+            region_scores = self.score_matrices.get(region_name)
         
-        # Calculate enhanced suitability scores
-        recommendations = []
+        weight_vector = self._weight_vector(weights)
+        return self._rank(region_scores, region_scores.components @ weight_vector, top_n)
+    
+    def cache_stats(self):
+        """Hit/miss/eviction counters of the recommendation cache"""
+        return self.recommendation_cache.stats()
+    
+    def _cache_key(self, region_info, weather_data, catalog, soil_version, normals_version, top_n):
+        """Cache key covering every input the scoring depends on"""
+        weather_fingerprint = (
+            float(weather_data['avg_temp']), float(weather_data['annual_rainfall']),
+            monthly_climatology(weather_data).tobytes()
+        )
+        return (region_info['name'], region_info['climate_zone'], weather_fingerprint,
+                catalog.version, soil_version, normals_version, top_n)
+    
+    def _weight_vector(self, weights):
+        """Normalised weight vector in SCORE_COMPONENTS order"""
+        if isinstance(weights, dict):
+            unknown = set(weights) - set(SCORE_COMPONENTS)
+            if unknown:
+                raise ValueError(f"Unknown score components: {', '.join(sorted(unknown))}")
+            weight_vector = np.array([weights.get(name, default) for name, default in zip(SCORE_COMPONENTS, SCORE_WEIGHTS)])
+        else:
+            weight_vector = np.asarray(weights, dtype=float)
+            if weight_vector.shape != SCORE_WEIGHTS.shape:
+                raise ValueError(f"Expected {len(SCORE_COMPONENTS)} weights, got {weight_vector.size}")
+        
+        total = weight_vector.sum()
+        if np.any(weight_vector < 0) or total <= 0:
+            raise ValueError("Weights must be non-negative and not all zero")
+        return weight_vector / total
+    
+    def _score_regions(self, catalog, regions, weather_list):
+        """
+        Score every region x crop pair. Returns the per-region score matrices
+        of the suitable crops and the regions x crops weighted final scores.
+        """
         
-        for crop in suitable_crops:
-            # Climate suitability (already calculated)
-            climate_score = crop['suitability_score']
-            
-            # Soil suitability analysis
-            if region_soil:
-                soil_analysis = analyze_soil_crop_compatibility(crop, region_soil)
-                soil_score = soil_analysis['overall_score']
-                crop['soil_analysis'] = soil_analysis
-            else:
-                soil_score = 7.0  # Default moderate score if no soil data
-                crop['soil_analysis'] = None
-            
-            # Economic attractiveness score
-            economic_score = self._calculate_economic_score(crop)
-            
-            # Regional bonus (if crop is commonly grown in the region)
-            regional_score = self._calculate_regional_score(crop, region_info)
-            
-            # Market demand score (based on crop type and current trends)
-            market_score = self._calculate_market_score(crop)
-            
-            # Risk assessment score
-            risk_score = self._calculate_risk_score(crop, weather_data)
-            
-            # Calculate weighted final score with soil analysis
-            final_score = (
-                climate_score * 0.25 +
-                soil_score * 0.25 +
-                economic_score * 0.20 +
-                regional_score * 0.12 +
-                market_score * 0.10 +
-                risk_score * 0.08
-            )
-            
-            crop['suitability_score'] = round(final_score, 2)
-            crop['climate_score'] = round(climate_score, 2)
-            crop['soil_score'] = round(soil_score, 2)
-            crop['economic_score'] = round(economic_score, 2)
-            crop['regional_score'] = round(regional_score, 2)
-            crop['market_score'] = round(market_score, 2)
-            crop['risk_score'] = round(risk_score, 2)
-            
-            recommendations.append(crop)
+        # Extract climate parameters
+        avg_temp = np.array([weather['avg_temp'] for weather in weather_list], dtype=float)
+        annual_rainfall = np.array([weather['annual_rainfall'] for weather in weather_list], dtype=float)
+        
+        # Climate suitability for every region x crop pair
+        suitable, climate_scores = catalog.climate_suitability(
+            (avg_temp - 5, avg_temp + 5),
+            (annual_rainfall * 0.8, annual_rainfall * 1.2)
+        )
+        
+        soil_matrix, soil_scores, soil_rows = self._soil_score_matrix(regions)
+        
+        components = np.stack(np.broadcast_arrays(
+            climate_scores,
+            soil_scores,
+            self._economic_scores(catalog),
+            self._regional_score_matrix(catalog, regions),
+            self._market_scores(catalog),
+            self._risk_score_matrix(catalog, regions, weather_list)
+        ), axis=-1)
+        
+        # Calculate weighted final score with soil analysis
+        final_scores = components @ SCORE_WEIGHTS
+        
+        scored = []
+        region_final_scores = []
+        for r in range(len(regions)):
+            candidates = np.flatnonzero(suitable[r])
+            scored.append(RegionScores(catalog, candidates, components[r, candidates], soil_matrix, soil_rows[r]))
+            region_final_scores.append(final_scores[r, candidates])
+        
+        return scored, region_final_scores
+    
+    def _rank(self, region_scores, final_scores, top_n):
+        """Top-N recommendations of a region for the given final scores"""
+        ranking_scores = np.round(final_scores, 2)
+        climate_scores = region_scores.components[:, 0]
+        
+        # Partial sort: keep only crops scoring at least the N-th best (ties included)
+        selected = np.arange(len(ranking_scores))
+        if top_n < len(selected):
+            kth = np.argpartition(-ranking_scores, top_n - 1)[top_n - 1]
+            selected = np.flatnonzero(ranking_scores >= ranking_scores[kth])
         
-        # Sort by final suitability score
-        recommendations.sort(key=lambda x: x['suitability_score'], reverse=True)
+        # Sort by final score, ties keep the climate-score order
+        order = selected[np.lexsort((selected, -climate_scores[selected], -ranking_scores[selected]))][:top_n]
         
-        return recommendations[:top_n]
+        recommendations = []
+        for k in order.tolist():
+            crop_index = int(region_scores.candidates[k])
+            scores = {name: round(value, 2) for name, value in zip(SCORE_COMPONENTS, region_scores.components[k].tolist())}
+            recommendations.append(region_scores.catalog.score(
+                crop_index,
+                suitability_score=round(float(final_scores[k]), 2),
+                soil_analysis=region_scores.soil_analysis(crop_index),
+                **scores
+            ))
+        
+        return recommendations
     
-    def _calculate_economic_score(self, crop):
-        """Calculate economic attractiveness score (0-10)"""
-        roi = crop['roi']
-        profit_margin = crop['profit_margin']
+    def _soil_score_matrix(self, regions):
+        """Soil suitability scores (regions x crops) and each region's soil matrix row"""
+        soil_matrix = get_soil_compatibility_matrix()
+        rows = [soil_matrix.region_row(region_info['name']) for region_info in regions]
+        
+        scores = np.full((len(regions), len(soil_matrix.catalog)), 7.0)  # Default moderate score if no soil data
+        known = [r for r, row in enumerate(rows) if row is not None]
+        scores[known] = soil_matrix.overall[[rows[r] for r in known]]
         
+        return soil_matrix, scores, rows
+    
+    def _economic_scores(self, catalog):
+        """Economic attractiveness score (0-10) for every crop"""
         # Normalize ROI (0-200% maps to 0-10)
-        roi_score = min(10, roi / 20)
+        roi_score = np.minimum(10, catalog.columns['roi'] / 20)
         
         # Normalize profit margin (0-100% maps to 0-10)
-        margin_score = min(10, profit_margin / 10)
+        margin_score = np.minimum(10, catalog.columns['profit_margin'] / 10)
         
         return (roi_score + margin_score) / 2
     
-    def _calculate_regional_score(self, crop, region_info):
-        """Calculate regional suitability score (0-10)"""
-        
-        # Crop-region compatibility mapping
-        regional_bonuses = {
-            'Rice (Basmati)': ['Punjab', 'Haryana', 'Uttar Pradesh'],
-            'Wheat': ['Punjab', 'Haryana', 'Uttar Pradesh', 'Madhya Pradesh'],
-            'Cotton': ['Gujarat', 'Maharashtra', 'Andhra Pradesh', 'Punjab'],
-            'Sugarcane': ['Uttar Pradesh', 'Maharashtra', 'Karnataka'],
-            'Soybean': ['Madhya Pradesh', 'Maharashtra', 'Rajasthan'],
-            'Sunflower': ['Karnataka', 'Andhra Pradesh', 'Maharashtra'],
-            'Chana (Chickpea)': ['Madhya Pradesh', 'Rajasthan', 'Maharashtra'],
-            'Tomato': ['Karnataka', 'Andhra Pradesh', 'Maharashtra'],
-            'Onion': ['Maharashtra', 'Karnataka', 'Gujarat'],
-            'Chili': ['Andhra Pradesh', 'Karnataka', 'Tamil Nadu']
-        }
-        
-        crop_name = crop['name']
-        region_name = region_info['name']
-        
-        if crop_name in regional_bonuses and region_name in regional_bonuses[crop_name]:
-            return 8.0  # High regional compatibility
-        elif crop['type'] in ['Cereals', 'Pulses'] and region_info['climate_zone'] in ['Subtropical', 'Tropical']:
-            return 6.0  # Moderate compatibility
-        # elif crop['type'] in ['Vegetables', 'Fruits'] and region_info['annual_rainfall'] > 800:
-            # return 7.0  # Good for vegetables/fruits with adequate rainfall
-        else:
-            return 5.0  # Neutral/average compatibility
+    def _regional_score_matrix(self, catalog, regions):
+        """Regional suitability score (0-10) for every region x crop pair"""
+        crop_types = catalog.columns['type']
+        staple = np.isin(crop_types, ['Cereals', 'Pulses'])
+        warm_zone = np.array([region['climate_zone'] in ['Subtropical', 'Tropical'] for region in regions])
+        
+        # Moderate compatibility for staples in warm zones, neutral otherwise
+        scores = np.where(staple & warm_zone[:, None], 6.0, 5.0)
+        
+        # High regional compatibility
+        bonus_crops = {}
+        for c, crop_name in enumerate(catalog.columns['name']):
+            for region_name in REGIONAL_BONUSES.get(crop_name, []):
+                bonus_crops.setdefault(region_name, []).append(c)
+        for r, region in enumerate(regions):
+            scores[r, bonus_crops.get(region['name'], [])] = 8.0
+        
+        return scores
     
-    def _calculate_market_score(self, crop):
-        """Calculate market demand score (0-10)"""
-        
-        # Market demand factors based on crop type and price trends
-        market_factors = {
-            'Pulses': 9.0,  # High demand due to protein needs
-            'Oilseeds': 8.0,  # Growing oil consumption
-            'Vegetables': 8.5,  # Urban demand growth
-            'Fruits': 7.5,  # Premium market
-            'Cereals': 7.0,  # Stable demand
-        }
-        
-        base_score = market_factors.get(crop['type'], 6.0)
+    def _market_scores(self, catalog):
+        """Market demand score (0-10) for every crop"""
+        base_score = np.array([MARKET_FACTORS.get(crop_type, 6.0) for crop_type in catalog.columns['type']])
         
         # Price premium adjustment
-        if crop['market_price'] > 3000:  # High-value crops
-            price_bonus = 1.0
-        elif crop['market_price'] > 2000:
-            price_bonus = 0.5
-        else:
-            price_bonus = 0.0
+        price = catalog.columns['market_price']
+        price_bonus = np.select([price > 3000, price > 2000], [1.0, 0.5], 0.0)
         
-        return min(10, base_score + price_bonus)
+        return np.minimum(10, base_score + price_bonus)
     
-    def _calculate_risk_score(self, crop, weather_data):
-        """Calculate risk assessment score (0-10, higher is lower risk)"""
+    def _risk_score_matrix(self, catalog, regions, weather_list):
+        """Risk assessment score (0-10, higher is lower risk) for every region x crop pair"""
+        water_requirement = catalog.columns['water_requirement']
+        water_score = np.array([WATER_RISK_SCORES.get(req, 5.0) for req in water_requirement])
         
-        # Water requirement risk
-        water_risk_map = {'High': 3.0, 'Medium': 7.0, 'Low': 9.0}
-        water_score = water_risk_map.get(crop['water_requirement'], 5.0)
-        
-        # Weather variability risk
-        if weather_data['annual_rainfall'] < 500:  # Drought-prone
-            if crop['water_requirement'] == 'Low':
-                weather_score = 8.0
-            else:
-                weather_score = 4.0
-        elif weather_data['annual_rainfall'] > 2000:  # Flood-prone
-            if crop['type'] == 'Vegetables':
-                weather_score = 5.0
-            else:
-                weather_score = 7.0
-        else:
-            weather_score = 8.0
+        # Weather variability risk: share of seasons simulated around the region's weather in which the crop fails
+        scenarios = self.scenario_engine.simulate([region['name'] for region in regions], catalog, weather_list)
+        weather_score = 10 * (1 - scenarios['failure_probability'])
         
         # Growing period risk (shorter period = lower risk)
-        if crop['growing_period_days'] < 90:
-            period_score = 9.0
-        elif crop['growing_period_days'] < 120:
-            period_score = 7.0
-        else:
-            period_score = 6.0
+        period = catalog.columns['growing_period_days']
+        period_score = np.select([period < 90, period < 120], [9.0, 7.0], 6.0)
         
         return (water_score + weather_score + period_score) / 3
     
+    def _region_recommendations(self, region_name, top_n=50):
+        """Scored recommendations for a region name, shared by the helper views below"""
+        region_data = {'name': region_name, 'climate_zone': 'Subtropical'}  # Simplified
+        weather_data = self.weather_cache.get_or_set(
+            region_name, lambda: get_climate_normals([region_name]).region_weather(region_name)
+        )
+        return self.get_recommendations(region_data, weather_data, top_n=top_n)
+    
     def get_filtered_recommendations(self, region_name, crop_type="All", min_roi=0, max_investment=100000):
         """Get recommendations with additional filters"""
         
         # Get base recommendations
-        region_data = {'name': region_name, 'climate_zone': 'Subtropical'}  # Simplified
-        weather_data = get_weather_data_for_region(region_name)
-        recommendations = self.get_recommendations(region_data, weather_data)
+        recommendations = self._region_recommendations(region_name)[:15]
         
         # Apply filters
         filtered = []
@@ -208,14 +342,13 @@ class CropRecommendationEngine:
     def compare_crops(self, crop_names, region_name):
         """Compare specific crops for a region"""
         
-        region_data = {'name': region_name, 'climate_zone': 'Subtropical'}
-        weather_data = get_weather_data_for_region(region_name)
-        all_recommendations = self.get_recommendations(region_data, weather_data, top_n=50)
+        all_recommendations = self._region_recommendations(region_name)
         
         # Filter for requested crops
+        by_name = {crop['name']: crop for crop in all_recommendations}
         comparison = []
         for crop_name in crop_names:
-            crop_data = next((crop for crop in all_recommendations if crop['name'] == crop_name), None)
+            crop_data = by_name.get(crop_name)
             if crop_data:
                 comparison.append(crop_data)
         
@@ -224,25 +357,12 @@ class CropRecommendationEngine:
     def get_seasonal_recommendations(self, region_name, season):
         """Get recommendations for specific season"""
         
-        region_data = {'name': region_name, 'climate_zone': 'Subtropical'}
-        weather_data = get_weather_data_for_region(region_name)
-        all_recommendations = self.get_recommendations(region_data, weather_data, top_n=50)
+        all_recommendations = self._region_recommendations(region_name)
         
-        # Filter by season
-        seasonal_crops = []
-        
-        season_map = {
-            'Kharif': ['Kharif', 'Monsoon', 'Jun', 'Jul', 'Aug'],
-            'Rabi': ['Rabi', 'Winter', 'Nov', 'Dec', 'Jan', 'Feb'],
-            'Zaid': ['Zaid', 'Summer', 'Mar', 'Apr', 'May']
-        }
-        
-        season_keywords = season_map.get(season, [])
-        
-        for crop in all_recommendations:
-            growing_season = crop['growing_season'].lower()
-            if any(keyword.lower() in growing_season for keyword in season_keywords):
-                seasonal_crops.append(crop)
+        # Filter by season flags parsed from each crop's growing season
+        catalog = get_crop_catalog()
+        in_season = catalog.season_mask(season)
+        seasonal_crops = [crop for crop in all_recommendations if in_season[catalog.name_index[crop['name']]]]
         
         return seasonal_crops
     
@@ -253,15 +373,14 @@ class CropRecommendationEngine:
             return None
         
         # Get crop data
-        region_data = {'name': region_name, 'climate_zone': 'Subtropical'}
-        weather_data = get_weather_data_for_region(region_name)
-        all_recommendations = self.get_recommendations(region_data, weather_data, top_n=50)
+        all_recommendations = self._region_recommendations(region_name)
         
+        by_name = {crop['name']: crop for crop in all_recommendations}
         portfolio_risk = 0
         total_weight = sum(allocations)
         
         for i, crop_name in enumerate(selected_crops):
-            crop_data = next((crop for crop in all_recommendations if crop['name'] == crop_name), None)
+            crop_data = by_name.get(crop_name)
             if crop_data:
                 weight = allocations[i] / total_weight
                 crop_risk = 10 - crop_data['risk_score']  # Convert to risk (higher = more risky)
@@ -272,21 +391,33 @@ class CropRecommendationEngine:
     def get_diversification_suggestions(self, current_crops, region_name):
         """Suggest crops for diversification"""
         
-        region_data = {'name': region_name, 'climate_zone': 'Subtropical'}
-        weather_data = get_weather_data_for_region(region_name)
-        all_recommendations = self.get_recommendations(region_data, weather_data, top_n=50)
+        all_recommendations = self._region_recommendations(region_name)
         
         # Get types of current crops
+        recommended = {crop['name'] for crop in all_recommendations}
         current_types = set()
-        for crop_name in current_crops:
-            crop_data = next((crop for crop in all_recommendations if crop['name'] == crop_name), None)
-            if crop_data:
+        for crop_data in get_crop_catalog().lookup_many(current_crops):
+            if crop_data and crop_data['name'] in recommended:
                 current_types.add(crop_data['type'])
         
         # Suggest crops from different types
+        current_crops = set(current_crops)
         diversification_suggestions = []
         for crop in all_recommendations:
             if crop['type'] not in current_types and crop['name'] not in current_crops:
                 diversification_suggestions.append(crop)
         
         return diversification_suggestions[:5]  # Top 5 suggestions
+
+_engine = None
+
+def get_recommendation_engine():
+    """
+    Engine shared by every page and Streamlit rerun, so its recommendation
+    cache and re-ranking score matrices outlive a single script run.
+    Pass region_name to rerank(): last_region is shared between sessions.
+    """
+    global _engine
+    if _engine is None:
+        _engine = CropRecommendationEngine()
+    return _engine
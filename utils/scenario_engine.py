@@ -0,0 +1,169 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from data.weather_data import WEATHER_VARIABLES
+from data.climate_normals import get_climate_normals
+from data.crop_database import get_crop_catalog
+
+SCENARIO_PERCENTILES = (10, 50, 90)
+# Regions per block when building monthly rainfall, bounding memory to ~chunk x scenarios x 12
+SCENARIO_CHUNK = 256
+
+class ScenarioEngine:
+    """
+    Monte Carlo weather scenarios per region, drawn around the region's
+    monthly weather (the caller's, or else its climate normals) with the
+    year-to-year spread of the climate normals, with every crop's climate
+    suitability evaluated over all scenarios at once.
+    All regions share one batch of standard normal draws (common random
+    numbers) scaled to their own climatology, so with a seed a region's
+    results depend only on (seed, its monthly weather): runs are reproducible
+    and results are cached per region and monthly weather; seed=None draws
+    afresh each time.
+    """
+
+    def __init__(self, n_scenarios=1000, seed=0, processes=None):
+        self.n_scenarios = n_scenarios
+        self.seed = seed
+        self.processes = processes
+        self._results = {}
+        self._version = None
+
+    def simulate(self, region_names, catalog=None, weather_list=None):
+        """
+        Failure probability and suitability score distribution of every
+        region x crop pair, as (regions, crops) arrays keyed by statistic.
+        weather_list: weather dicts of the regions (as scored by the engine);
+        scenarios are centred on their monthly temperature and rainfall
+        """
+        catalog = catalog or get_crop_catalog()
+        normals = get_climate_normals(region_names)
+        version = (normals.version, catalog.version)
+        if version != self._version:
+            self._results.clear()
+            self._version = version
+
+        rows = [normals.region_index[name] for name in region_names]
+        variables = [WEATHER_VARIABLES.index('avg_temp'), WEATHER_VARIABLES.index('rainfall')]
+        normal_mean = normals.mean[rows][..., variables]
+        normal_std = normals.std[rows][..., variables]
+        if weather_list is None:
+            mean = normal_mean
+        else:
+            mean = np.stack([monthly_climatology(weather) for weather in weather_list])
+
+        # Temperature spread carries over as is; rainfall keeps its relative spread
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rain_cv = np.where(normal_mean[..., 1] > 0, normal_std[..., 1] / normal_mean[..., 1], 0)
+        std = np.stack([normal_std[..., 0], rain_cv * mean[..., 1]], axis=-1)
+
+        # Unseeded runs draw fresh scenarios, so nothing is kept
+        results = self._results if self.seed is not None else {}
+        keys = [(name, np.round(region_mean, 1).tobytes()) for name, region_mean in zip(region_names, mean)]
+        first = {}
+        for i, key in enumerate(keys):
+            first.setdefault(key, i)
+        missing = [i for key, i in first.items() if key not in results]
+        if missing:
+            climatology = (mean[missing], std[missing])
+            results.update(zip([keys[i] for i in missing],
+                               self._run([region_names[i] for i in missing], climatology, catalog)))
+
+        results = [results[key] for key in keys]
+        return {key: np.stack([result[key] for result in results]) for key in results[0]}
+
+    def _run(self, region_names, climatology, catalog):
+        """Per-region results, optionally split across a process pool"""
+        c = catalog.columns
+        bounds = np.stack([c['temp_min'], c['temp_max'], c['rainfall_min'], c['rainfall_max']])
+        draws = draw_standard_scenarios(self.n_scenarios, self.seed)
+        mean, std = climatology
+
+        if not self.processes or self.processes < 2 or len(region_names) < 2:
+            return _simulate_regions(mean, std, draws, bounds)
+
+        chunks = np.array_split(np.arange(len(region_names)), self.processes)
+        chunks = [chunk for chunk in chunks if len(chunk)]
+        with ProcessPoolExecutor(max_workers=self.processes) as pool:
+            parts = pool.map(
+                _simulate_regions,
+                [mean[chunk] for chunk in chunks],
+                [std[chunk] for chunk in chunks],
+                [draws] * len(chunks),
+                [bounds] * len(chunks)
+            )
+            return [result for part in parts for result in part]
+
+def monthly_climatology(weather):
+    """(months, 2) array of the monthly mean temperature and rainfall of a weather dict"""
+    return np.array([
+        [temp['avg_temp'], rain['rainfall']]
+        for temp, rain in zip(weather['monthly_temp'], weather['monthly_rainfall'])
+    ], dtype=float)
+
+def draw_standard_scenarios(n_scenarios, seed=None):
+    """(2, scenarios, months) standard normal draws of temperature and rainfall, in one call"""
+    return np.random.default_rng(seed).standard_normal((2, n_scenarios, 12))
+
+def draw_seasonal_scenarios(mean, std, draws, chunk_size=SCENARIO_CHUNK):
+    """
+    Annual mean temperature and total rainfall of every scenario per region,
+    as (regions, scenarios) arrays, from the shared standard draws. Monthly
+    temperatures are normal and monthly rainfall lognormal (matching mean
+    and spread) around the (regions, months, 2) climatology.
+    """
+    temp_mean, rain_mean = mean[..., 0], mean[..., 1]
+    temp_std, rain_std = std[..., 0], std[..., 1]
+    temp_draws, rain_draws = draws
+
+    # The annual mean of normal months is linear in the draws: one matrix product
+    temp = temp_mean.mean(axis=1)[:, None] + temp_std @ temp_draws.T / 12
+
+    # Lognormal by the method of moments; dry months stay at zero
+    wet = rain_mean > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sigma2 = np.where(wet, np.log1p((rain_std / np.where(wet, rain_mean, 1)) ** 2), 0)
+        mu = np.where(wet, np.log(np.where(wet, rain_mean, 1)) - sigma2 / 2, -np.inf)
+    sigma = np.sqrt(sigma2)
+
+    # Monthly rainfall is (regions, scenarios, months); built a block of regions at a time
+    rainfall = np.empty(temp.shape)
+    for start in range(0, len(mean), chunk_size):
+        block = slice(start, start + chunk_size)
+        monthly = np.exp(mu[block, None, :] + sigma[block, None, :] * rain_draws)
+        rainfall[block] = monthly.sum(axis=-1)
+    return temp, rainfall
+
+def _simulate_regions(mean, std, draws, bounds):
+    """Scenario statistics of each region against every crop's (4, crops) climate bounds"""
+    temp, rainfall = draw_seasonal_scenarios(mean, std, draws)
+    blocks = [
+        _scenario_statistics(temp[start:start + SCENARIO_CHUNK], rainfall[start:start + SCENARIO_CHUNK], bounds)
+        for start in range(0, len(temp), SCENARIO_CHUNK)
+    ]
+    stats = {key: np.concatenate([block[key] for block in blocks]) for key in blocks[0]}
+    return [{key: values[r] for key, values in stats.items()} for r in range(len(temp))]
+
+def _scenario_statistics(temp, rainfall, bounds):
+    """(regions, crops) statistics of (regions, scenarios) annual weather against the crops' bounds"""
+    # (regions, crops, scenarios): reductions run along the contiguous last axis
+    temp, rainfall = temp[:, None, :], rainfall[:, None, :]
+    temp_min, temp_max, rainfall_min, rainfall_max = bounds[..., None]
+
+    # A scenario fails a crop when the engine's climate filter would reject it
+    suitable = (
+        (temp_min <= temp + 5) & (temp_max >= temp - 5) &
+        (rainfall_min <= rainfall * 1.2) & (rainfall_max >= rainfall * 0.8)
+    )
+
+    # Same scale as the engine's climate score
+    temp_score = np.clip(10 - np.abs((temp_min + temp_max) / 2 - temp) / 5, 0, 10)
+    rainfall_score = np.clip(10 - np.abs((rainfall_min + rainfall_max) / 2 - rainfall) / 200, 0, 10)
+    scores = (temp_score + rainfall_score) / 2
+
+    percentiles = np.percentile(scores, SCENARIO_PERCENTILES, axis=-1)
+    return {
+        'failure_probability': 1 - suitable.mean(axis=-1),
+        'score_mean': scores.mean(axis=-1),
+        'score_std': scores.std(axis=-1),
+        **{f'score_p{q}': percentiles[j] for j, q in enumerate(SCENARIO_PERCENTILES)}
+    }
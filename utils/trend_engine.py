@@ -0,0 +1,95 @@
+import numpy as np
+from scipy import stats
+
+TREND_METHODS = ('ols', 'theil_sen')
+
+def compute_trends(values, x=None, method='ols'):
+    """
+    Linear trends of every row of a (series, time) matrix in one pass.
+    Missing values (NaN) are left out of their own series. Returns a dict of
+    per-series arrays: slope, intercept, r, r_squared, stderr and p_value.
+
+    method='ols' gives the least-squares fit with the same statistics as
+    scipy.stats.linregress. method='theil_sen' gives the median pairwise
+    slope, with the p-value of the Mann-Kendall test. Its stderr is NaN.
+    """
+    if method not in TREND_METHODS:
+        raise ValueError(f"Unknown trend method: {method}")
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    x = np.arange(values.shape[1], dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    if method == 'theil_sen':
+        return _theil_sen_trends(values, x)
+    return _ols_trends(values, x)
+
+def _ols_trends(values, x):
+    """Closed-form least squares over the observed points of each row"""
+    observed = np.isfinite(values)
+    n = observed.sum(axis=1)
+    y = np.where(observed, values, 0.0)
+    xs = np.where(observed, x, 0.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = xs.sum(axis=1) / n
+        y_mean = y.sum(axis=1) / n
+        dx = np.where(observed, x - x_mean[:, None], 0.0)
+        dy = np.where(observed, values - y_mean[:, None], 0.0)
+        sxx = (dx ** 2).sum(axis=1)
+        syy = (dy ** 2).sum(axis=1)
+        sxy = (dx * dy).sum(axis=1)
+
+        slope = sxy / sxx
+        intercept = y_mean - slope * x_mean
+
+        # Constant series have no explained variance
+        r = np.where((sxx > 0) & (syy > 0), sxy / np.sqrt(sxx * syy), 0.0)
+        r = np.clip(r, -1.0, 1.0)
+        df = n - 2
+        stderr = np.sqrt((1 - r ** 2) * syy / sxx / df)
+        t = r * np.sqrt(df / ((1.0 - r) * (1.0 + r)))
+        p_value = 2 * stats.t.sf(np.abs(t), df)
+
+    too_short = n < 3
+    stderr = np.where(too_short, np.nan, stderr)
+    p_value = np.where(too_short, np.nan, p_value)
+    return {
+        'slope': slope,
+        'intercept': intercept,
+        'r': r,
+        'r_squared': r ** 2,
+        'stderr': stderr,
+        'p_value': p_value
+    }
+
+def _theil_sen_trends(values, x):
+    """Median pairwise slopes with Mann-Kendall significance"""
+    first, second = np.triu_indices(values.shape[1], k=1)
+    dx = x[second] - x[first]
+    dy = values[:, second] - values[:, first]
+    distinct = dx != 0
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = np.nanmedian(np.where(distinct, dy / dx, np.nan), axis=1)
+        observed = np.isfinite(values)
+        intercept = np.nanmedian(values, axis=1) - slope * np.nanmedian(np.where(observed, x, np.nan), axis=1)
+
+        # Goodness of fit of the robust line
+        residual = values - (intercept[:, None] + slope[:, None] * x)
+        total = np.nansum((values - np.nanmean(values, axis=1)[:, None]) ** 2, axis=1)
+        r_squared = np.where(total > 0, 1 - np.nansum(residual ** 2, axis=1) / total, 0.0)
+
+        # Mann-Kendall test (normal approximation, without tie correction)
+        n = observed.sum(axis=1)
+        score = np.nansum(np.sign(dx) * np.sign(dy), axis=1)
+        variance = n * (n - 1) * (2 * n + 5) / 18
+        z = (score - np.sign(score)) / np.sqrt(variance)
+        p_value = np.where(n >= 3, 2 * stats.norm.sf(np.abs(z)), np.nan)
+
+    return {
+        'slope': slope,
+        'intercept': intercept,
+        'r': np.sign(slope) * np.sqrt(np.clip(r_squared, 0, None)),
+        'r_squared': r_squared,
+        'stderr': np.full(len(values), np.nan),
+        'p_value': p_value
+    }